@@ -8,7 +8,7 @@ import json
 import logging
 import os
 import sys
-from typing import List
+from typing import List, TextIO
 
 from .core.rag_system import RAGrep
 from .retrieval.embeddings import get_runtime_device_info
@@ -26,7 +26,7 @@ def _build_common_parser(description: str) -> argparse.ArgumentParser:
     parser.add_argument(
         "--db-path",
         default=os.getenv("RAGREP_DB_PATH", "./.ragrep.db"),
-        help="Path to local SQLite database",
+        help="Path to local SQLite database (:memory: for a throwaway in-process index)",
     )
     parser.add_argument(
         "--chunk-size",
@@ -55,6 +55,23 @@ def _build_common_parser(description: str) -> argparse.ArgumentParser:
         default=os.getenv("RAGREP_DEVICE", "auto"),
         help="Embedding device: auto, cpu, cuda, mps, or explicit device (e.g. cuda:0)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("RAGREP_EMBED_WORKERS", "0") or 0),
+        help="Embedding worker processes for large index runs (0 or 1 disables)",
+    )
+    parser.add_argument(
+        "--backend",
+        default=os.getenv("RAGREP_BACKEND", "torch"),
+        help="Embedding runtime: torch, onnx, or openvino (onnx/openvino need extra packages)",
+    )
+    parser.add_argument(
+        "--vector-dtype",
+        choices=("float32", "float16", "int8"),
+        default=os.getenv("RAGREP_VECTOR_DTYPE", "float32"),
+        help="Stored chunk vector precision; float16 halves and int8 quarters the chunk vectors (changing it rebuilds)",
+    )
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
     return parser
 
@@ -99,33 +116,33 @@ def _build_gpu_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def _run_gpu_info(args: argparse.Namespace) -> int:
+def _run_gpu_info(args: argparse.Namespace, out: TextIO) -> int:
     info = get_runtime_device_info(args.device)
     if args.json:
-        print(json.dumps(info, indent=2))
+        print(json.dumps(info, indent=2), file=out)
     else:
-        print(f"Requested: {info['requested_device']}")
-        print(f"Resolved: {info['resolved_device']}")
-        print(f"PyTorch available: {info['torch_available']}")
-        print(f"CUDA available: {info['cuda_available']}")
-        print(f"CUDA device count: {info['cuda_device_count']}")
+        print(f"Requested: {info['requested_device']}", file=out)
+        print(f"Resolved: {info['resolved_device']}", file=out)
+        print(f"PyTorch available: {info['torch_available']}", file=out)
+        print(f"CUDA available: {info['cuda_available']}", file=out)
+        print(f"CUDA device count: {info['cuda_device_count']}", file=out)
         if info["cuda_devices"]:
-            print("CUDA devices:")
+            print("CUDA devices:", file=out)
             for index, name in enumerate(info["cuda_devices"]):
-                print(f"  {index}: {name}")
-        print(f"MPS available: {info['mps_available']}")
+                print(f"  {index}: {name}", file=out)
+        print(f"MPS available: {info['mps_available']}", file=out)
     return 0
 
 
-def _print_file_paths(title: str, paths: list[str]) -> None:
+def _print_file_paths(title: str, paths: list[str], out: TextIO) -> None:
     if not paths:
         return
-    print(f"{title}:")
+    print(f"{title}:", file=out)
     for path in paths:
-        print(path)
+        print(path, file=out)
 
 
-def _print_index_status(index_result: dict) -> None:
+def _print_index_status(index_result: dict, out: TextIO) -> None:
     root = index_result.get("root") or index_result.get("indexed_root") or "."
     new_files = index_result.get("new_files") or []
     updated_files = index_result.get("updated_files") or []
@@ -134,26 +151,29 @@ def _print_index_status(index_result: dict) -> None:
     if index_result.get("indexed"):
         print(
             f"Index updated for {root}: "
-            f"{len(new_files)} added, {len(updated_files)} modified, {len(removed_files)} removed."
+            f"{len(new_files)} added, {len(updated_files)} modified, {len(removed_files)} removed.",
+            file=out,
         )
-        _print_file_paths("Added files", new_files)
-        _print_file_paths("Modified files", updated_files)
-        _print_file_paths("Removed files", removed_files)
+        _print_file_paths("Added files", new_files, out)
+        _print_file_paths("Modified files", updated_files, out)
+        _print_file_paths("Removed files", removed_files, out)
         print(
             f"Indexed {index_result['indexed_files']} changed files "
             f"({index_result['chunks_indexed']} chunks updated, {index_result['chunks']} total): "
-            f"{index_result['reason']}"
+            f"{index_result['reason']}",
+            file=out,
         )
         return
 
     print(
         f"Index is already up to date for {root} "
         f"({index_result['files']} files, {index_result['chunks']} chunks): "
-        f"{index_result['reason']}"
+        f"{index_result['reason']}",
+        file=out,
     )
 
 
-def _run_recall(args: argparse.Namespace) -> int:
+def _run_recall(args: argparse.Namespace, out: TextIO) -> int:
     setup_logging(args.verbose)
     query = " ".join(args.query).strip()
 
@@ -164,6 +184,9 @@ def _run_recall(args: argparse.Namespace) -> int:
         embedding_model=args.model,
         model_dir=args.model_dir,
         embedding_device=args.device,
+        embedding_workers=args.workers,
+        embedding_backend=args.backend,
+        vector_dtype=args.vector_dtype,
     ) as rag:
         result = rag.recall(
             query,
@@ -173,24 +196,24 @@ def _run_recall(args: argparse.Namespace) -> int:
         )
 
     if args.json:
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, indent=2), file=out)
         return 0
 
     index_info = result.get("auto_index")
     if index_info:
-        _print_index_status(index_info)
+        _print_index_status(index_info, out)
 
     matches = result.get("matches", [])
-    print(f"Results: {len(matches)}")
+    print(f"Results: {len(matches)}", file=out)
     for position, match in enumerate(matches, start=1):
         source = match.get("metadata", {}).get("source", "unknown")
-        print(f"{position}. score={match['score']:.4f} source={source}")
-        print(match.get("text", "").rstrip())
+        print(f"{position}. score={match['score']:.4f} source={source}", file=out)
+        print(match.get("text", "").rstrip(), file=out)
 
     return 0
 
 
-def _run_index(args: argparse.Namespace) -> int:
+def _run_index(args: argparse.Namespace, out: TextIO) -> int:
     setup_logging(args.verbose)
 
     with RAGrep(
@@ -200,19 +223,22 @@ def _run_index(args: argparse.Namespace) -> int:
         embedding_model=args.model,
         model_dir=args.model_dir,
         embedding_device=args.device,
+        embedding_workers=args.workers,
+        embedding_backend=args.backend,
+        vector_dtype=args.vector_dtype,
     ) as rag:
         result = rag.index(path=args.path, force=args.force)
 
     if args.json:
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, indent=2), file=out)
         return 0
 
-    _print_index_status(result)
+    _print_index_status(result, out)
 
     return 0
 
 
-def _run_stats(args: argparse.Namespace) -> int:
+def _run_stats(args: argparse.Namespace, out: TextIO) -> int:
     setup_logging(args.verbose)
 
     with RAGrep(
@@ -222,28 +248,32 @@ def _run_stats(args: argparse.Namespace) -> int:
         embedding_model=args.model,
         model_dir=args.model_dir,
         embedding_device=args.device,
+        embedding_workers=args.workers,
+        embedding_backend=args.backend,
+        vector_dtype=args.vector_dtype,
     ) as rag:
         result = rag.stats()
 
     if args.json:
-        print(json.dumps(result, indent=2))
+        print(json.dumps(result, indent=2), file=out)
     else:
-        print(f"Database: {result['persist_path']}")
-        print(f"Indexed root: {result.get('indexed_root')}")
-        print(f"Embedding model: {result.get('embedding_model')}")
-        print(f"Files: {result['total_files']}")
-        print(f"Chunks: {result['total_chunks']}")
-        print(f"Indexed at: {result.get('indexed_at')}")
+        print(f"Database: {result['persist_path']}", file=out)
+        print(f"Indexed root: {result.get('indexed_root')}", file=out)
+        print(f"Embedding model: {result.get('embedding_model')}", file=out)
+        print(f"Files: {result['total_files']}", file=out)
+        print(f"Chunks: {result['total_chunks']}", file=out)
+        print(f"Indexed at: {result.get('indexed_at')}", file=out)
 
     return 0
 
 
-def main(argv: List[str] | None = None) -> int:
+def main(argv: List[str] | None = None, *, out: TextIO | None = None) -> int:
     args_list = list(argv) if argv is not None else sys.argv[1:]
+    out = out if out is not None else sys.stdout
 
     if not args_list:
         parser = _build_recall_parser()
-        parser.print_help()
+        parser.print_help(out)
         return 0
 
     try:
@@ -251,31 +281,31 @@ def main(argv: List[str] | None = None) -> int:
         if first in {"--check-gpu", "--gpu-info"}:
             parser = _build_gpu_parser()
             args = parser.parse_args(args_list[1:])
-            return _run_gpu_info(args)
+            return _run_gpu_info(args, out)
 
         if first in {"--stats", "-s"}:
             parser = _build_stats_parser()
             args = parser.parse_args(args_list[1:])
-            return _run_stats(args)
+            return _run_stats(args, out)
 
         if first == "index":
             parser = _build_index_parser()
             args = parser.parse_args(args_list[1:])
-            return _run_index(args)
+            return _run_index(args, out)
 
         if first == "stats":
             parser = _build_stats_parser()
             args = parser.parse_args(args_list[1:])
-            return _run_stats(args)
+            return _run_stats(args, out)
 
         if first == "recall":
             parser = _build_recall_parser("ragrep recall")
             args = parser.parse_args(args_list[1:])
-            return _run_recall(args)
+            return _run_recall(args, out)
 
         parser = _build_recall_parser()
         args = parser.parse_args(args_list)
-        return _run_recall(args)
+        return _run_recall(args, out)
     except Exception as exc:
         print(f"Error: {exc}", file=sys.stderr)
         return 1
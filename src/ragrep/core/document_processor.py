@@ -3,10 +3,17 @@
 from __future__ import annotations
 
 import fnmatch
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List
 
 
+# File reads release the GIL, so larger batches are read on a thread pool;
+# below this many files the pool costs more than it saves.
+_PARALLEL_READ_MIN_FILES = 64
+
 _DEFAULT_EXTENSIONS = {
     ".avsc",
     ".c",
@@ -52,6 +59,8 @@ _DEFAULT_IGNORE_PATTERNS = {
     "*.sqlite",
     "*.sqlite3",
     "*.db",
+    "*.db-shm",
+    "*.db-wal",
     ".ragrep.db",
     ".ragrep.db.legacy/",
     "venv/",
@@ -110,20 +119,26 @@ class DocumentProcessor:
         return files, file_records, scan_root
 
     def process_files(self, files: Iterable[Path], scan_root: Path) -> List[Dict[str, Any]]:
+        files = list(files)
         chunks: List[Dict[str, Any]] = []
-        for file_path in files:
+        for file_path, text in zip(files, self._load_texts(files)):
             relative_path = file_path.relative_to(scan_root).as_posix()
-            text = self._load_text(file_path)
             chunks.extend(self._chunk_text(text, relative_path))
         return chunks
 
+    def _load_texts(self, files: List[Path]) -> List[str]:
+        if len(files) < _PARALLEL_READ_MIN_FILES:
+            return [self._load_text(file_path) for file_path in files]
+        with ThreadPoolExecutor() as pool:
+            return list(pool.map(self._load_text, files))
+
     def scan_files(
         self,
         root: Path,
         *,
         extra_ignore_paths: Iterable[Path] | None = None,
     ) -> List[Path]:
-        ignore_patterns = self._load_ignore_patterns(root)
+        should_ignore = self._compile_ignore_patterns(self._load_ignore_patterns(root))
         resolved_ignores = [path.expanduser().resolve() for path in (extra_ignore_paths or [])]
         files: List[Path] = []
 
@@ -136,7 +151,7 @@ class DocumentProcessor:
                 continue
 
             relative = file_path.relative_to(root).as_posix()
-            if self._should_ignore(relative, ignore_patterns):
+            if should_ignore(relative):
                 continue
 
             files.append(file_path)
@@ -213,29 +228,33 @@ class DocumentProcessor:
         return sorted(patterns)
 
     @staticmethod
-    def _should_ignore(relative_path: str, patterns: Iterable[str]) -> bool:
-        path = relative_path
-
+    def _compile_ignore_patterns(patterns: Iterable[str]) -> Callable[[str], bool]:
+        """Fold ignore patterns into one prefix tuple and one regex, built once per scan."""
+        directories: List[str] = []
+        globs: List[str] = []
         for pattern in patterns:
-            if pattern.startswith("!"):
-                continue
-
             normalized = pattern.strip()
-            if not normalized:
+            if not normalized or normalized.startswith("!"):
                 continue
-
             if normalized.endswith("/"):
-                directory = normalized.rstrip("/")
-                if path == directory or path.startswith(directory + "/"):
-                    return True
-                continue
-
-            if fnmatch.fnmatch(path, normalized):
-                return True
-            if fnmatch.fnmatch(Path(path).name, normalized):
+                directories.append(normalized.rstrip("/"))
+            else:
+                globs.append(fnmatch.translate(normalized))
+
+        directory_set = frozenset(directories)
+        prefixes = tuple(directory + "/" for directory in directories)
+        # fnmatch.fnmatch is case-insensitive where the filesystem is.
+        flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+        glob_match = re.compile("|".join(globs), flags).match if globs else None
+
+        def should_ignore(relative_path: str) -> bool:
+            if relative_path in directory_set or relative_path.startswith(prefixes):
                 return True
+            if glob_match is None:
+                return False
+            return bool(glob_match(relative_path) or glob_match(relative_path.rpartition("/")[2]))
 
-        return False
+        return should_ignore
 
     @staticmethod
     def _matches_extra_ignore(file_path: Path, ignored_paths: Iterable[Path]) -> bool:
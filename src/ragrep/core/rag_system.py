@@ -2,21 +2,31 @@
 
 from __future__ import annotations
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Protocol
 
+import numpy as np
+
 from .document_processor import DocumentProcessor
 from ..retrieval.embeddings import LocalEmbedder, default_model_dir
 from ..retrieval.vector_store import VectorStore
 
+logger = logging.getLogger(__name__)
+
+# New chunk texts are embedded and cached this many at a time, so an interrupted
+# index run keeps the vectors it already paid for.
+_EMBED_BATCH = 1024
+
 
 class _EmbedderProtocol(Protocol):
     model: str
 
-    def embed_texts(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:  # pragma: no cover
+    def embed_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:  # pragma: no cover
         ...
 
-    def embed_query(self, query: str) -> List[float]:  # pragma: no cover
+    def embed_query(self, query: str) -> np.ndarray:  # pragma: no cover
         ...
 
 
@@ -32,6 +42,9 @@ class RAGrep:
         embedding_model: str = "mxbai-embed-large",
         model_dir: str | None = None,
         embedding_device: str | None = None,
+        embedding_workers: int | None = None,
+        embedding_backend: str | None = None,
+        vector_dtype: str = "float32",
         embedder: _EmbedderProtocol | None = None,
     ) -> None:
         self.chunk_size = chunk_size
@@ -39,9 +52,11 @@ class RAGrep:
         self.embedding_model = embedding_model
         self.model_dir = model_dir
         self.embedding_device = embedding_device
+        self.embedding_workers = embedding_workers
+        self.embedding_backend = embedding_backend
 
         self.document_processor = DocumentProcessor(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-        self.vector_store = VectorStore(db_path)
+        self.vector_store = VectorStore(db_path, vector_dtype=vector_dtype)
         self._embedder: _EmbedderProtocol | None = embedder
 
     @property
@@ -52,16 +67,58 @@ class RAGrep:
                 model=self.embedding_model,
                 model_dir=self.model_dir,
                 device=self.embedding_device,
+                num_workers=self.embedding_workers,
+                backend=self.embedding_backend,
             )
         return self._embedder
 
+    def _embed_chunks(self, chunks: List[Dict[str, Any]]) -> np.ndarray:
+        """Embed chunk texts, reusing cached vectors for text seen before."""
+        texts = [chunk["text"] for chunk in chunks]
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        cached = self.vector_store.get_cached_embeddings(self.embedding_model, texts)
+        missing = sorted({text for position, text in enumerate(texts) if position not in cached})
+        if missing:
+            fresh_by_text: Dict[str, np.ndarray] = {}
+            batches = [missing[start:start + _EMBED_BATCH] for start in range(0, len(missing), _EMBED_BATCH)]
+            embedder = self.embedder
+            # The model runs on one worker thread (torch releases the GIL) while
+            # this thread, which owns the SQLite connection, caches the previous batch.
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pending = pool.submit(embedder.embed_texts, batches[0])
+                done = 0
+                for index, batch in enumerate(batches):
+                    vectors = np.asarray(pending.result(), dtype=np.float32)
+                    if index + 1 < len(batches):
+                        pending = pool.submit(embedder.embed_texts, batches[index + 1])
+                    self.vector_store.cache_embeddings(
+                        self.embedding_model,
+                        batch,
+                        vectors,
+                        keep_at_least=len(texts),
+                    )
+                    fresh_by_text.update(zip(batch, vectors))
+                    done += len(batch)
+                    logger.info("Embedded %d/%d new chunks", done, len(missing))
+            for position, text in enumerate(texts):
+                if position not in cached:
+                    cached[position] = fresh_by_text[text]
+
+        return np.stack([cached[position] for position in range(len(texts))]).astype(np.float32, copy=False)
+
     def _index_ignore_paths(self) -> List[Path]:
         model_cache = Path(self.model_dir).expanduser().resolve() if self.model_dir else default_model_dir()
         db_file = Path(self.vector_store.db_path).expanduser().resolve()
         return [
             model_cache,
             db_file,
+            Path(f"{db_file}-wal"),
+            Path(f"{db_file}-shm"),
             Path(f"{db_file}.legacy"),
+            Path(f"{db_file}.emb.npy"),
+            Path(f"{db_file}.ids.npy"),
         ]
 
     def index(self, path: str = ".", *, force: bool = False) -> Dict[str, Any]:
@@ -97,8 +154,7 @@ class RAGrep:
 
         if plan["full_rebuild"]:
             chunks = self.document_processor.process_files(files, root_path)
-            texts = [chunk["text"] for chunk in chunks]
-            embeddings = self.embedder.embed_texts(texts) if texts else []
+            embeddings = self._embed_chunks(chunks)
             self.vector_store.replace_index(
                 root_path=root_path,
                 files=file_records,
@@ -107,6 +163,7 @@ class RAGrep:
                 embedding_model=self.embedding_model,
                 chunk_size=self.chunk_size,
                 chunk_overlap=self.chunk_overlap,
+                bulk_load=True,
             )
         else:
             changed_paths = [
@@ -114,8 +171,7 @@ class RAGrep:
                 for relative_path in (plan["new_files"] + plan["updated_files"])
             ]
             chunks = self.document_processor.process_files(changed_paths, root_path)
-            texts = [chunk["text"] for chunk in chunks]
-            embeddings = self.embedder.embed_texts(texts) if texts else []
+            embeddings = self._embed_chunks(chunks)
             self.vector_store.apply_file_updates(
                 root_path=root_path,
                 all_files=file_records,
@@ -161,8 +217,11 @@ class RAGrep:
             effective_path = path or self.vector_store.get_indexed_root() or "."
             index_result = self.index(effective_path, force=False)
 
-        query_embedding = self.embedder.embed_query(query)
-        matches = self.vector_store.search(query_embedding, limit=limit)
+        # A blank query cannot match anything; skip loading the embedding model.
+        matches: List[Dict[str, Any]] = []
+        if query.strip():
+            query_embedding = self.embedder.embed_query(query)
+            matches = self.vector_store.search(query_embedding, limit=limit)
 
         return {
             "query": query,
@@ -185,6 +244,9 @@ class RAGrep:
         return self.stats()
 
     def close(self) -> None:
+        close_embedder = getattr(self._embedder, "close", None)
+        if callable(close_embedder):
+            close_embedder()
         self.vector_store.close()
 
     def __enter__(self) -> "RAGrep":
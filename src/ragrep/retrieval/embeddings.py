@@ -2,16 +2,35 @@
 
 from __future__ import annotations
 
+import inspect
 import os
 import sys
+from collections import OrderedDict
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Tuple
 
+import numpy as np
 
 _MODEL_ALIASES = {
     "mxbai-embed-large": "mixedbread-ai/mxbai-embed-large-v1",
 }
 
+# Below this many texts, spinning work out to worker processes costs more than it saves.
+_MIN_PARALLEL_TEXTS = 256
+
+# GPUs only saturate with larger batches; on CPU small batches keep padding low.
+_CPU_BATCH_SIZE = 32
+_GPU_BATCH_SIZE = 128
+
+# Recent query vectors are kept so repeated recalls skip the model entirely.
+_QUERY_CACHE_SIZE = 1024
+
+# Device probes per torch module (by id; the module is kept so the id stays valid).
+# CUDA/MPS availability does not change within a process, and the first
+# torch.cuda.is_available() call can be slow.
+_DEVICE_PROBES: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+
 
 class EmbeddingError(RuntimeError):
     """Raised when embeddings cannot be generated."""
@@ -55,37 +74,57 @@ def get_runtime_device_info(requested: str | None = None) -> Dict[str, Any]:
     if torch is None:  # pragma: no cover - defensive guard
         return info
 
-    info["torch_available"] = True
+    probe = _probe_torch_devices(torch)
+    info.update(probe)
+    info["cuda_devices"] = list(probe["cuda_devices"])
+
+    if explicit:
+        info["resolved_device"] = value
+    elif info["cuda_available"]:
+        info["resolved_device"] = "cuda"
+    elif info["mps_available"]:
+        info["resolved_device"] = "mps"
+    else:
+        info["resolved_device"] = "cpu"
+
+    return info
+
+
+def _probe_torch_devices(torch: Any) -> Dict[str, Any]:
+    cached = _DEVICE_PROBES.get(id(torch))
+    if cached is not None and cached[0] is torch:
+        return cached[1]
 
     cuda_available = bool(hasattr(torch, "cuda") and torch.cuda.is_available())
-    info["cuda_available"] = cuda_available
+    count = 0
+    names: List[str] = []
     if cuda_available and hasattr(torch.cuda, "device_count"):
         count = int(torch.cuda.device_count())
-        info["cuda_device_count"] = count
-        names: List[str] = []
         if hasattr(torch.cuda, "get_device_name"):
             for index in range(count):
                 try:
                     names.append(str(torch.cuda.get_device_name(index)))
                 except Exception:
                     names.append(f"cuda:{index}")
-        info["cuda_devices"] = names
 
     backends = getattr(torch, "backends", None)
     mps = getattr(backends, "mps", None) if backends is not None else None
     mps_available = bool(mps is not None and hasattr(mps, "is_available") and mps.is_available())
-    info["mps_available"] = mps_available
 
-    if explicit:
-        info["resolved_device"] = value
-    elif cuda_available:
-        info["resolved_device"] = "cuda"
-    elif mps_available:
-        info["resolved_device"] = "mps"
-    else:
-        info["resolved_device"] = "cpu"
+    probe = {
+        "torch_available": True,
+        "cuda_available": cuda_available,
+        "cuda_device_count": count,
+        "cuda_devices": tuple(names),
+        "mps_available": mps_available,
+    }
+    _DEVICE_PROBES[id(torch)] = (torch, probe)
+    return probe
 
-    return info
+
+def _clear_device_cache() -> None:
+    """Forget cached device probes (tests swap fake torch modules in and out)."""
+    _DEVICE_PROBES.clear()
 
 
 def default_model_dir() -> Path:
@@ -138,6 +177,14 @@ def _has_local_model_snapshot(model: str, model_dir: Path) -> bool:
     return False
 
 
+def _accepts_keyword(function: Any, name: str) -> bool:
+    """Return whether ``function`` takes ``name`` as an explicit parameter."""
+    try:
+        return name in inspect.signature(function).parameters
+    except (TypeError, ValueError):
+        return False
+
+
 class LocalEmbedder:
     """Generate embeddings in-process using sentence-transformers."""
 
@@ -146,12 +193,21 @@ class LocalEmbedder:
         model: str = "mxbai-embed-large",
         model_dir: str | Path | None = None,
         device: str | None = None,
+        num_workers: int | None = None,
+        backend: str | None = None,
     ) -> None:
         self.model = model
         self.resolved_model = resolve_embedding_model(model)
         self.model_dir = Path(model_dir).expanduser().resolve() if model_dir else default_model_dir()
         self.requested_device = device or os.getenv("RAGREP_DEVICE", "auto")
         self.device = resolve_runtime_device(self.requested_device)
+        if num_workers is None:
+            num_workers = int(os.getenv("RAGREP_EMBED_WORKERS", "0") or 0)
+        self.num_workers = max(int(num_workers), 0)
+        self._pool: Any = None
+        self._query_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.backend = (backend or os.getenv("RAGREP_BACKEND", "torch")).strip().lower() or "torch"
+        self.onnx_file = os.getenv("RAGREP_ONNX_FILE") or None
         self.model_dir.mkdir(parents=True, exist_ok=True)
 
         try:
@@ -179,20 +235,58 @@ class LocalEmbedder:
                 except Exception as retry_exc:
                     raise EmbeddingError(
                         f"Failed to load embedding model '{self.resolved_model}'. "
-                        f"Model directory: {self.model_dir}."
+                        f"Model directory: {self.model_dir}. Backend: {self.backend}."
                     ) from retry_exc
             else:
                 raise EmbeddingError(
                     f"Failed to load embedding model '{self.resolved_model}'. "
-                    f"Model directory: {self.model_dir}."
+                    f"Model directory: {self.model_dir}. Backend: {self.backend}."
                 ) from exc
 
+        self._torch = self._configure_torch()
+
+    def _configure_torch(self) -> Any:
+        """Tune torch for inference and return the module (``None`` when absent)."""
+        try:
+            import torch  # type: ignore
+        except Exception:
+            return None
+        if torch is None:
+            return None
+
+        if self.device == "cpu" and hasattr(torch, "set_num_threads"):
+            threads = int(os.getenv("RAGREP_TORCH_THREADS", "0") or 0)
+            torch.set_num_threads(threads if threads > 0 else min(8, os.cpu_count() or 1))
+
+        if self.backend == "torch" and self.device.startswith("cuda") and os.getenv("RAGREP_FP16") == "1":
+            self._model.half()
+
+        return torch
+
+    def _inference_context(self) -> ExitStack:
+        stack = ExitStack()
+        torch = self._torch
+        if torch is None:
+            return stack
+
+        if hasattr(torch, "inference_mode"):
+            stack.enter_context(torch.inference_mode())
+        if self.device.startswith("cuda") and hasattr(torch, "autocast"):
+            stack.enter_context(torch.autocast("cuda", dtype=torch.float16))
+        return stack
+
     def _load_model(self, sentence_transformer_cls: Any, *, local_files_only: bool) -> Any:
         kwargs: Dict[str, Any] = {
             "cache_folder": str(self.model_dir),
             "device": self.device,
             "local_files_only": local_files_only,
         }
+        if self.backend != "torch":
+            # ONNX Runtime / OpenVINO need sentence-transformers>=3.2 with the
+            # matching extra installed, e.g. pip install "ragrep[onnx]".
+            kwargs["backend"] = self.backend
+            if self.onnx_file:
+                kwargs["model_kwargs"] = {"file_name": self.onnx_file}
 
         try:
             return sentence_transformer_cls(self.resolved_model, **kwargs)
@@ -203,23 +297,93 @@ class LocalEmbedder:
         kwargs.pop("local_files_only", None)
         return sentence_transformer_cls(self.resolved_model, **kwargs)
 
-    def embed_texts(self, texts: Iterable[str], batch_size: int = 32) -> List[List[float]]:
+    def embed_texts(
+        self,
+        texts: Iterable[str],
+        batch_size: int | None = None,
+        *,
+        sort_by_length: bool = True,
+    ) -> np.ndarray:
+        """Embed ``texts`` into a float32 ``(len(texts), dim)`` array, in input order.
+
+        With ``sort_by_length`` the inputs are encoded shortest-first so each
+        batch pads to similar lengths ("smart batching"), then scattered back
+        to the caller's order. ``batch_size`` defaults to 128 on CUDA and 32
+        elsewhere.
+        """
         items = list(texts)
         if not items:
-            return []
-
-        vectors = self._model.encode(
-            items,
-            batch_size=batch_size,
-            show_progress_bar=False,
-            normalize_embeddings=False,
-            convert_to_numpy=True,
-        )
-        return vectors.tolist()
+            return np.empty((0, 0), dtype=np.float32)
+        if batch_size is None:
+            batch_size = self._default_batch_size()
+
+        order = np.argsort([len(item) for item in items], kind="stable") if sort_by_length else None
+        if order is not None:
+            items = [items[index] for index in order]
 
-    def embed_query(self, query: str) -> List[float]:
-        vectors = self.embed_texts([query], batch_size=1)
-        return vectors[0]
+        # Worker processes shard CPU encoding; on a GPU they would only load extra model copies.
+        if self.device == "cpu" and self.num_workers > 1 and len(items) >= _MIN_PARALLEL_TEXTS:
+            vectors = self.encode_parallel(items, batch_size=batch_size)
+        else:
+            with self._inference_context():
+                vectors = self._model.encode(
+                    items,
+                    batch_size=batch_size,
+                    show_progress_bar=False,
+                    normalize_embeddings=False,
+                    convert_to_numpy=True,
+                )
+        if order is not None:
+            ordered = np.empty_like(vectors)
+            ordered[order] = vectors
+            vectors = ordered
+        return np.asarray(vectors, dtype=np.float32)
+
+    def _default_batch_size(self) -> int:
+        return _GPU_BATCH_SIZE if self.device.startswith("cuda") else _CPU_BATCH_SIZE
+
+    def embed_query(self, query: str) -> np.ndarray:
+        cached = self._query_cache.get(query)
+        if cached is not None:
+            self._query_cache.move_to_end(query)
+            return cached
+
+        vector = self.embed_texts([query], batch_size=1)[0]
+        vector.setflags(write=False)
+        self._query_cache[query] = vector
+        if len(self._query_cache) > _QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return vector
+
+    def encode_parallel(self, items: List[str], *, batch_size: int = 32) -> np.ndarray:
+        """Encode ``items`` across ``num_workers`` CPU processes, reusing one pool."""
+        if self._pool is None:
+            self._pool = self._model.start_multi_process_pool(
+                target_devices=["cpu"] * max(self.num_workers, 1)
+            )
+        if _accepts_keyword(self._model.encode, "pool"):
+            return self._model.encode(
+                items,
+                pool=self._pool,
+                batch_size=batch_size,
+                show_progress_bar=False,
+                normalize_embeddings=False,
+                convert_to_numpy=True,
+            )
+        # sentence-transformers 3.x and 4.x only offer the (since deprecated) helper.
+        return self._model.encode_multi_process(items, self._pool, batch_size=batch_size)
+
+    def close(self) -> None:
+        """Stop the worker pool started by ``encode_parallel``, if any."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            self._model.stop_multi_process_pool(pool)
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
 
 
 # Backward-compatible alias.
@@ -2,14 +2,76 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-import math
+import operator
+import os
 import shutil
 import sqlite3
-from array import array
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+# Metadata is always encoded with the standard library so the optional extra
+# never changes what can be stored (non-string keys, big ints, NaN); orjson
+# only speeds up decoding.
+if orjson is not None:
+
+    def _json_loads(text: str) -> Any:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # json.dumps writes NaN and Infinity, which orjson rejects.
+            return json.loads(text)
+
+else:  # pragma: no cover - exercised only without orjson
+    _json_loads = json.loads
+
+
+def _json_dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+# Embedders hand over float32 matrices; plain nested lists are still accepted.
+Embeddings = Union[np.ndarray, Sequence[Sequence[float]]]
+
+# Search scans every embedding, so let SQLite map the file and keep a large page cache.
+_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+_CACHE_SIZE_KIB = 64 * 1024
+# Embedding BLOBs are several KB each; larger pages mean fewer overflow pages.
+_PAGE_SIZE_BYTES = 8192
+
+# Stay under SQLite's default host-parameter limit (999 before 3.32).
+_SQL_VARIABLE_BATCH = 500
+
+_EMBEDDING_CACHE_MIN_ENTRIES = 10_000
+# Pruning hashes every live chunk text, so it waits until the cache has grown a
+# quarter past its target instead of running after every batch.
+_EMBEDDING_CACHE_SLACK_DIVISOR = 4
+_INSERT_BATCH = 10_000
+_FETCH_BATCH = 4096
+_RESULT_CACHE_SIZE = 128
+# Bump when _create_tables changes so existing databases pick up the new DDL.
+_SCHEMA_VERSION = 1
+_MEMORY_DB_PATH = ":memory:"
+_CHUNK_FIELDS = operator.itemgetter(
+    "id", "file_path", "chunk_index", "start_char", "end_char", "text", "metadata"
+)
+
+# Chunks store L2-normalised vectors in one of these dtypes; older databases
+# stored raw float32 vectors. float16 halves the chunk BLOBs and int8 (with a
+# float32 per-row scale prefix) quarters them; the search matrix is float32.
+_VECTOR_DTYPES = ("float32", "float16", "int8")
+_INT8_SCALE_BYTES = 4
 
 
 def _normalise_db_path(db_path: str) -> Path:
@@ -19,85 +81,297 @@ def _normalise_db_path(db_path: str) -> Path:
     return path
 
 
+# (chunk id, text, metadata JSON, score) for one search hit.
+_Hit = Tuple[str, str, str, float]
+
+
+def _format_matches(hits: List[_Hit]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": chunk_id,
+            "text": text,
+            "metadata": _json_loads(metadata_json),
+            "score": score,
+            "distance": 1.0 - score,
+        }
+        for chunk_id, text, metadata_json, score in hits
+    ]
+
+
+def _stored_dtype(stored_format: str) -> str:
+    """Return the dtype named by a ``vector_format`` value such as ``unit-float16``."""
+    stored_dtype = stored_format.rpartition("-")[2]
+    return stored_dtype if stored_dtype in _VECTOR_DTYPES else "float32"
+
+
+def _sidecar_header(index_token: str) -> np.ndarray:
+    """Two int64 words identifying ``index_token``, stored ahead of the sidecar row ids."""
+    return np.frombuffer(hashlib.blake2b(index_token.encode("utf-8"), digest_size=16).digest(), dtype=np.int64)
+
+
+def _as_matrix(embeddings: Embeddings) -> np.ndarray:
+    try:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+    except ValueError as exc:
+        raise ValueError("Embeddings must all have the same dimension") from exc
+    if matrix.size == 0:
+        return matrix.reshape(0, 0)
+    if matrix.ndim != 2:
+        raise ValueError("Embeddings must all have the same dimension")
+    return matrix
+
+
+def _vector_format(dtype: str) -> str:
+    return f"unit-{dtype}"
+
+
 def _pack_vector(vector: Iterable[float]) -> bytes:
-    values = array("f", [float(value) for value in vector])
-    return values.tobytes()
+    return np.ascontiguousarray(vector, dtype=np.float32).tobytes()
+
+
+def _unpack_vector(payload: bytes, dtype: str = "float32") -> np.ndarray:
+    if dtype == "int8":
+        scale = np.frombuffer(payload, dtype=np.float32, count=1)[0]
+        return np.frombuffer(payload, dtype=np.int8, offset=_INT8_SCALE_BYTES) * scale
+    return np.frombuffer(payload, dtype=dtype)
+
 
+def _encode_rows(unit_vectors: np.ndarray, dtype: str) -> np.ndarray:
+    """Return one C-contiguous storage row per vector in the on-disk layout."""
+    if dtype != "int8":
+        return np.ascontiguousarray(unit_vectors, dtype=dtype)
 
-def _unpack_vector(payload: bytes) -> array:
-    values = array("f")
-    values.frombytes(payload)
-    return values
+    # Symmetric per-row quantisation: the float32 scale leads each row's bytes.
+    peaks = np.abs(unit_vectors).max(axis=1) if unit_vectors.size else np.zeros(len(unit_vectors))
+    scales = (np.where(peaks > 0, peaks, 1.0) / 127.0).astype(np.float32)
+    quantised = np.clip(np.rint(unit_vectors / scales[:, None]), -127, 127).astype(np.int8)
+    rows = np.empty((len(unit_vectors), _INT8_SCALE_BYTES + quantised.shape[1]), dtype=np.uint8)
+    rows[:, :_INT8_SCALE_BYTES] = scales.view(np.uint8).reshape(-1, _INT8_SCALE_BYTES)
+    rows[:, _INT8_SCALE_BYTES:] = quantised.view(np.uint8)
+    return rows
+
+
+def _normalise_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(unit_rows, norms)``; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=1) if matrix.size else np.zeros(len(matrix), dtype=np.float32)
+    scale = np.where(norms > 0, norms, 1.0).astype(np.float32)
+    return matrix / scale[:, None], norms
+
+
+def _chunk_rows(
+    chunks: Sequence[Dict[str, Any]],
+    stored_rows: np.ndarray,
+    norms: np.ndarray,
+    dim: int,
+) -> Iterator[Tuple[Any, ...]]:
+    # Normalising once at insert time turns cosine similarity into a plain dot
+    # product at query time; the original norm is kept for reference.
+    # ``stored_rows`` is already C-contiguous in the storage layout, so each
+    # row is bound as a zero-copy memoryview instead of a fresh bytes object.
+    dumps = _json_dumps
+    for (chunk_id, file_path, chunk_index, start_char, end_char, text, metadata), vector, norm in zip(
+        map(_CHUNK_FIELDS, chunks), stored_rows, norms.tolist()
+    ):
+        yield (
+            chunk_id,
+            file_path,
+            int(chunk_index),
+            int(start_char),
+            int(end_char),
+            text,
+            dumps(metadata),
+            vector.data,
+            dim,
+            norm,
+        )
 
 
-def _vector_norm(vector: Iterable[float]) -> float:
-    return math.sqrt(sum(float(value) * float(value) for value in vector))
+def _files_digest(files: Iterable[Dict[str, Any]]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for path, size, mtime_ns in sorted(
+        (entry["path"], int(entry["size"]), int(entry["mtime_ns"])) for entry in files
+    ):
+        digest.update(f"{path}|{size}|{mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _text_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _top_k_indices(scores: np.ndarray, limit: int) -> np.ndarray:
+    """Indices of the ``limit`` highest scores, best first, without a full sort."""
+    count = scores.shape[0]
+    k = min(limit, count)
+    if k < count:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(count)
+    return top[np.argsort(-scores[top], kind="stable")]
 
 
 class VectorStore:
     """Persist chunks + embeddings in a local SQLite database file."""
 
-    def __init__(self, db_path: str = "./.ragrep.db") -> None:
-        self.db_path = _normalise_db_path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+    def __init__(
+        self,
+        db_path: str = "./.ragrep.db",
+        *,
+        mmap_size: int = _MMAP_SIZE_BYTES,
+        cache_size_kib: int = _CACHE_SIZE_KIB,
+        page_size: int = _PAGE_SIZE_BYTES,
+        vector_dtype: str = "float32",
+    ) -> None:
+        if vector_dtype not in _VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector dtype {vector_dtype!r}; expected one of {_VECTOR_DTYPES}")
+        self.vector_dtype = vector_dtype
+        self._vector_format = _vector_format(vector_dtype)
+
+        # ":memory:" keeps the whole index in this process (no file, no sidecars).
+        self.in_memory = db_path == _MEMORY_DB_PATH
+        if self.in_memory:
+            self.db_path = Path(_MEMORY_DB_PATH)
+        else:
+            self.db_path = _normalise_db_path(db_path)
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Migrate old directory-based storage automatically.
-        if self.db_path.exists() and self.db_path.is_dir():
-            legacy_path = self.db_path.with_name(f"{self.db_path.name}.legacy")
-            if legacy_path.exists():
-                shutil.rmtree(legacy_path)
-            self.db_path.rename(legacy_path)
+            # Migrate old directory-based storage automatically.
+            if self.db_path.exists() and self.db_path.is_dir():
+                legacy_path = self.db_path.with_name(f"{self.db_path.name}.legacy")
+                if legacy_path.exists():
+                    shutil.rmtree(legacy_path)
+                self.db_path.rename(legacy_path)
 
         self.connection = sqlite3.connect(str(self.db_path))
         self.connection.row_factory = sqlite3.Row
-        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.create_function("ragrep_text_hash", 1, _text_hash, deterministic=True)
+        self._configure_connection(
+            mmap_size=mmap_size,
+            cache_size_kib=cache_size_kib,
+            page_size=page_size,
+        )
         self._create_tables()
+        self._cache_legacy_vectors()
+
+        # Search results and the search matrix are reused only while the database's
+        # index_token still matches, so changes made by other connections are seen too.
+        self._result_cache: OrderedDict[Tuple[bytes, int, str | None], List[_Hit]] = OrderedDict()
+        self._cached_token: str | None = None
+        self._matrix: np.ndarray | None = None
+        self._matrix_dim = 0
+        self._rowids: np.ndarray = np.empty(0, dtype=np.int64)
+
+    @property
+    def matrix_path(self) -> Path:
+        return self.db_path.with_name(f"{self.db_path.name}.emb.npy")
+
+    @property
+    def rowids_path(self) -> Path:
+        return self.db_path.with_name(f"{self.db_path.name}.ids.npy")
 
     def close(self) -> None:
+        # Drop the (possibly memory-mapped) matrix before closing the database.
+        self._matrix = None
+        self._cached_token = None
         self.connection.close()
 
+    @contextmanager
+    def _read_snapshot(self) -> Iterator[None]:
+        """Run the enclosed reads against a single snapshot of the database."""
+        if self.connection.in_transaction:
+            yield
+            return
+        self.connection.execute("BEGIN")
+        try:
+            yield
+        finally:
+            self.connection.commit()
+
+    def _configure_connection(self, *, mmap_size: int, cache_size_kib: int, page_size: int) -> None:
+        # page_size only takes effect before the first table exists (and before WAL).
+        if self.connection.execute("PRAGMA page_count").fetchone()[0] == 0:
+            self.connection.execute(f"PRAGMA page_size = {int(page_size)}")
+        if os.getenv("RAGREP_SQLITE_FAST") == "1":
+            # Throwaway databases (tests, CI scratch indexes): no journal file, no fsyncs.
+            self._synchronous = "OFF"
+            self.connection.execute("PRAGMA journal_mode = MEMORY")
+        else:
+            # WAL lets a recall read while another process re-indexes; NORMAL sync is
+            # durable enough for an index that can always be rebuilt from source.
+            self._synchronous = "NORMAL"
+            self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute(f"PRAGMA synchronous = {self._synchronous}")
+        self.connection.execute("PRAGMA temp_store = MEMORY")
+        self.connection.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        self.connection.execute(f"PRAGMA cache_size = -{int(cache_size_kib)}")
+        self.connection.execute("PRAGMA foreign_keys = ON")
+
     def _create_tables(self) -> None:
+        # user_version records the schema this code created; when it is current
+        # the DDL is skipped entirely on open.
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version >= _SCHEMA_VERSION:
+            return
+
+        self.connection.executescript(
+            f"""
+            BEGIN;
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                id TEXT PRIMARY KEY,
+                file_path TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                start_char INTEGER NOT NULL,
+                end_char INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                metadata_json TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                embedding_dim INTEGER NOT NULL,
+                embedding_norm REAL NOT NULL,
+                FOREIGN KEY(file_path) REFERENCES files(path) ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS idx_chunks_file_path
+            ON chunks(file_path);
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                embedding_model TEXT NOT NULL,
+                text_hash BLOB NOT NULL,
+                embedding BLOB NOT NULL,
+                PRIMARY KEY (embedding_model, text_hash)
+            );
+            PRAGMA user_version = {_SCHEMA_VERSION};
+            COMMIT;
+            """
+        )
+
+    def _cache_legacy_vectors(self) -> None:
+        """Seed the embedding cache from databases that stored raw vectors.
+
+        Such indexes are rebuilt for the current vector format, but their rows
+        still hold the embedder's exact output, so the rebuild need not re-embed.
+        """
+        metadata = self._get_metadata()
+        embedding_model = metadata.get("embedding_model")
+        if not embedding_model or "vector_format" in metadata:
+            return
+
+        rows = self.connection.execute("SELECT text, embedding FROM chunks").fetchall()
         with self.connection:
-            self.connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS metadata (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL
-                )
-                """
-            )
-            self.connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS files (
-                    path TEXT PRIMARY KEY,
-                    size INTEGER NOT NULL,
-                    mtime_ns INTEGER NOT NULL
-                )
-                """
-            )
-            self.connection.execute(
-                """
-                CREATE TABLE IF NOT EXISTS chunks (
-                    id TEXT PRIMARY KEY,
-                    file_path TEXT NOT NULL,
-                    chunk_index INTEGER NOT NULL,
-                    start_char INTEGER NOT NULL,
-                    end_char INTEGER NOT NULL,
-                    text TEXT NOT NULL,
-                    metadata_json TEXT NOT NULL,
-                    embedding BLOB NOT NULL,
-                    embedding_dim INTEGER NOT NULL,
-                    embedding_norm REAL NOT NULL,
-                    FOREIGN KEY(file_path) REFERENCES files(path) ON DELETE CASCADE
-                )
-                """
-            )
-            self.connection.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_chunks_file_path
-                ON chunks(file_path)
+            self.connection.executemany(
                 """
+                INSERT OR IGNORE INTO embedding_cache (embedding_model, text_hash, embedding)
+                VALUES (?, ?, ?)
+                """,
+                [(embedding_model, _text_hash(row["text"]), row["embedding"]) for row in rows],
             )
+            self._set_metadata("vector_format", "raw-float32")
 
     def needs_reindex(
         self,
@@ -130,6 +404,26 @@ class VectorStore:
     ) -> Dict[str, Any]:
         metadata = self._get_metadata()
 
+        # The stored digest covers every (path, size, mtime_ns) record, so an
+        # unchanged tree is detected without reading the files table.
+        if (
+            not force
+            and metadata.get("indexed_root") == str(root_path)
+            and metadata.get("embedding_model") == embedding_model
+            and metadata.get("chunk_size") == str(chunk_size)
+            and metadata.get("chunk_overlap") == str(chunk_overlap)
+            and metadata.get("vector_format") == self._vector_format
+            and metadata.get("files_digest") == _files_digest(files)
+        ):
+            return {
+                "needs_index": False,
+                "full_rebuild": False,
+                "reason": "index is current",
+                "new_files": [],
+                "updated_files": [],
+                "removed_files": [],
+            }
+
         db_files = {
             row["path"]: (int(row["size"]), int(row["mtime_ns"]))
             for row in self.connection.execute("SELECT path, size, mtime_ns FROM files")
@@ -199,6 +493,16 @@ class VectorStore:
                 "removed_files": sorted(set(db_files) - set(current_files)),
             }
 
+        if metadata.get("vector_format") != self._vector_format:
+            return {
+                "needs_index": True,
+                "full_rebuild": True,
+                "reason": "index format changed",
+                "new_files": sorted(current_files.keys()),
+                "updated_files": [],
+                "removed_files": sorted(set(db_files) - set(current_files)),
+            }
+
         current_paths = set(current_files)
         db_paths = set(db_files)
 
@@ -233,14 +537,45 @@ class VectorStore:
         root_path: Path,
         files: List[Dict[str, Any]],
         chunks: List[Dict[str, Any]],
-        embeddings: List[List[float]],
+        embeddings: Embeddings,
         embedding_model: str,
         chunk_size: int,
         chunk_overlap: int,
+        bulk_load: bool = False,
     ) -> None:
+        embeddings = _as_matrix(embeddings)
         if len(chunks) != len(embeddings):
             raise ValueError("Chunk count and embedding count must match")
 
+        # A full rebuild can always be redone from source, so it may skip the
+        # fsyncs; WAL still keeps the file consistent if the process dies.
+        if bulk_load:
+            self.connection.execute("PRAGMA synchronous = OFF")
+        try:
+            self._replace_index(
+                root_path=root_path,
+                files=files,
+                chunks=chunks,
+                embeddings=embeddings,
+                embedding_model=embedding_model,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+            )
+        finally:
+            if bulk_load:
+                self.connection.execute(f"PRAGMA synchronous = {self._synchronous}")
+
+    def _replace_index(
+        self,
+        *,
+        root_path: Path,
+        files: List[Dict[str, Any]],
+        chunks: List[Dict[str, Any]],
+        embeddings: np.ndarray,
+        embedding_model: str,
+        chunk_size: int,
+        chunk_overlap: int,
+    ) -> None:
         with self.connection:
             self.connection.execute("DELETE FROM chunks")
             self.connection.execute("DELETE FROM files")
@@ -248,47 +583,31 @@ class VectorStore:
             if files:
                 self.connection.executemany(
                     "INSERT INTO files (path, size, mtime_ns) VALUES (?, ?, ?)",
-                    [
+                    (
                         (
                             entry["path"],
                             int(entry["size"]),
                             int(entry["mtime_ns"]),
                         )
                         for entry in files
-                    ],
+                    ),
                 )
 
-            if chunks:
-                self.connection.executemany(
-                    """
-                    INSERT INTO chunks (
-                        id, file_path, chunk_index, start_char, end_char,
-                        text, metadata_json, embedding, embedding_dim, embedding_norm
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    [
-                        (
-                            chunk["id"],
-                            chunk["file_path"],
-                            int(chunk["chunk_index"]),
-                            int(chunk["start_char"]),
-                            int(chunk["end_char"]),
-                            chunk["text"],
-                            json.dumps(chunk["metadata"], ensure_ascii=True),
-                            _pack_vector(vector),
-                            len(vector),
-                            _vector_norm(vector),
-                        )
-                        for chunk, vector in zip(chunks, embeddings)
-                    ],
-                )
+            self._insert_chunks(chunks, embeddings)
 
-            now = datetime.now(timezone.utc).isoformat()
-            self._set_metadata("indexed_root", str(root_path))
-            self._set_metadata("embedding_model", embedding_model)
-            self._set_metadata("chunk_size", str(chunk_size))
-            self._set_metadata("chunk_overlap", str(chunk_overlap))
-            self._set_metadata("indexed_at", now)
+            self._set_metadata_many(
+                [
+                    ("indexed_root", str(root_path)),
+                    ("embedding_model", embedding_model),
+                    ("chunk_size", str(chunk_size)),
+                    ("chunk_overlap", str(chunk_overlap)),
+                    ("files_digest", _files_digest(files)),
+                    ("embedding_dim", str(embeddings.shape[1])),
+                    ("vector_format", self._vector_format),
+                    ("index_token", uuid.uuid4().hex),
+                    ("indexed_at", datetime.now(timezone.utc).isoformat()),
+                ]
+            )
 
     def apply_file_updates(
         self,
@@ -296,7 +615,7 @@ class VectorStore:
         root_path: Path,
         all_files: List[Dict[str, Any]],
         chunks: List[Dict[str, Any]],
-        embeddings: List[List[float]],
+        embeddings: Embeddings,
         new_files: List[str],
         updated_files: List[str],
         removed_files: List[str],
@@ -304,124 +623,362 @@ class VectorStore:
         chunk_size: int,
         chunk_overlap: int,
     ) -> None:
+        embeddings = _as_matrix(embeddings)
         if len(chunks) != len(embeddings):
             raise ValueError("Chunk count and embedding count must match")
 
+        # Every chunk in an index shares one dimension; it is checked once per
+        # batch here rather than per row.
+        indexed_dim = int(self._get_metadata().get("embedding_dim") or 0)
+        if len(embeddings) and indexed_dim and indexed_dim != embeddings.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {embeddings.shape[1]} does not match the index ({indexed_dim})"
+            )
+
         changed_paths = sorted(set(new_files + updated_files))
         file_lookup = {entry["path"]: entry for entry in all_files}
         missing_paths = [path for path in changed_paths if path not in file_lookup]
         if missing_paths:
             raise ValueError(f"Missing file records for changed paths: {missing_paths}")
 
+        # Only rows belonging to changed or removed files are touched; chunks of
+        # unchanged files stay in place. Deleting a file row cascades to its
+        # chunks, so changed files are simply dropped and re-inserted.
+        stale_paths = sorted(set(removed_files) | set(changed_paths))
+
+        index_token = uuid.uuid4().hex
         with self.connection:
-            if removed_files:
-                self.connection.executemany(
-                    "DELETE FROM chunks WHERE file_path = ?",
-                    [(path,) for path in removed_files],
-                )
-                self.connection.executemany(
-                    "DELETE FROM files WHERE path = ?",
-                    [(path,) for path in removed_files],
+            # Take the write lock up front so the warm-matrix check and the patch
+            # below see exactly the rows this transaction replaces.
+            self.connection.execute("BEGIN IMMEDIATE")
+            # Rows are packed in this store's dtype, so they may only join an index
+            # written in the same format (another process may have rebuilt it).
+            stored_format = self._get_metadata().get("vector_format")
+            if stored_format != self._vector_format:
+                raise ValueError(
+                    f"Vector format {self._vector_format} does not match the index ({stored_format})"
                 )
+            # A search matrix that is current for the database is patched in
+            # place instead of reloaded.
+            patch_matrix = self._matrix is not None and self._cached_token == self._index_token()
+            stale_rowids = self._rowids_for_paths(stale_paths) if patch_matrix else None
+
+            self._delete_where_in("files", "path", stale_paths)
 
             if changed_paths:
                 self.connection.executemany(
-                    "DELETE FROM chunks WHERE file_path = ?",
-                    [(path,) for path in changed_paths],
-                )
-                self.connection.executemany(
-                    """
-                    INSERT INTO files (path, size, mtime_ns) VALUES (?, ?, ?)
-                    ON CONFLICT(path) DO UPDATE SET
-                        size = excluded.size,
-                        mtime_ns = excluded.mtime_ns
-                    """,
-                    [
+                    "INSERT INTO files (path, size, mtime_ns) VALUES (?, ?, ?)",
+                    (
                         (
                             path,
                             int(file_lookup[path]["size"]),
                             int(file_lookup[path]["mtime_ns"]),
                         )
                         for path in changed_paths
-                    ],
+                    ),
                 )
 
-            if chunks:
-                self.connection.executemany(
-                    """
-                    INSERT INTO chunks (
-                        id, file_path, chunk_index, start_char, end_char,
-                        text, metadata_json, embedding, embedding_dim, embedding_norm
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    [
-                        (
-                            chunk["id"],
-                            chunk["file_path"],
-                            int(chunk["chunk_index"]),
-                            int(chunk["start_char"]),
-                            int(chunk["end_char"]),
-                            chunk["text"],
-                            json.dumps(chunk["metadata"], ensure_ascii=True),
-                            _pack_vector(vector),
-                            len(vector),
-                            _vector_norm(vector),
-                        )
-                        for chunk, vector in zip(chunks, embeddings)
-                    ],
-                )
+            self._insert_chunks(chunks, embeddings)
+
+            self._set_metadata_many(
+                [
+                    ("indexed_root", str(root_path)),
+                    ("embedding_model", embedding_model),
+                    ("chunk_size", str(chunk_size)),
+                    ("chunk_overlap", str(chunk_overlap)),
+                    ("files_digest", _files_digest(all_files)),
+                    ("embedding_dim", str(embeddings.shape[1] if len(embeddings) else indexed_dim)),
+                    ("vector_format", self._vector_format),
+                    ("index_token", index_token),
+                    ("indexed_at", datetime.now(timezone.utc).isoformat()),
+                ]
+            )
+
+            if stale_rowids is not None:
+                self._patch_matrix(stale_rowids, changed_paths, index_token, stored_format)
+
+    def get_cached_embeddings(self, embedding_model: str, texts: Sequence[str]) -> Dict[int, np.ndarray]:
+        """Return cached embeddings for ``texts`` keyed by position in ``texts``."""
+        positions: Dict[bytes, List[int]] = {}
+        for position, text in enumerate(texts):
+            positions.setdefault(_text_hash(text), []).append(position)
+
+        hashes = list(positions)
+        found: Dict[int, np.ndarray] = {}
+        for start in range(0, len(hashes), _SQL_VARIABLE_BATCH):
+            batch = hashes[start:start + _SQL_VARIABLE_BATCH]
+            placeholders = ", ".join("?" for _ in batch)
+            rows = self.connection.execute(
+                f"""
+                SELECT text_hash, embedding FROM embedding_cache
+                WHERE embedding_model = ? AND text_hash IN ({placeholders})
+                """,
+                [embedding_model, *batch],
+            )
+            for row in rows:
+                vector = _unpack_vector(row["embedding"])
+                for position in positions[bytes(row["text_hash"])]:
+                    found[position] = vector
+        return found
+
+    def cache_embeddings(
+        self,
+        embedding_model: str,
+        texts: Sequence[str],
+        embeddings: Embeddings,
+        *,
+        keep_at_least: int = 0,
+    ) -> None:
+        """Remember embeddings by chunk text so unchanged chunks are not re-embedded.
 
-            now = datetime.now(timezone.utc).isoformat()
-            self._set_metadata("indexed_root", str(root_path))
-            self._set_metadata("embedding_model", embedding_model)
-            self._set_metadata("chunk_size", str(chunk_size))
-            self._set_metadata("chunk_overlap", str(chunk_overlap))
-            self._set_metadata("indexed_at", now)
+        ``keep_at_least`` protects entries written earlier in the same index run
+        from pruning when the cache is filled in several batches.
+        """
+        embeddings = _as_matrix(embeddings)
+        if len(texts) != len(embeddings):
+            raise ValueError("Text count and embedding count must match")
+        if not texts:
+            return
 
-    def search(self, query_embedding: List[float], limit: int = 20) -> List[Dict[str, Any]]:
+        with self.connection:
+            self.connection.executemany(
+                """
+                INSERT OR REPLACE INTO embedding_cache (embedding_model, text_hash, embedding)
+                VALUES (?, ?, ?)
+                """,
+                (
+                    (embedding_model, _text_hash(text), _pack_vector(vector))
+                    for text, vector in zip(texts, embeddings)
+                ),
+            )
+            # Keep the newest entries: enough for the live index plus churn
+            # (branch switches, reverted edits), without growing forever. Hits
+            # never refresh an entry's rowid, so entries for texts still in the
+            # index are exempt; they are what the next rebuild reuses.
+            total_chunks = self.connection.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+            keep = max(_EMBEDDING_CACHE_MIN_ENTRIES, 2 * int(total_chunks), len(texts), keep_at_least)
+            cached_entries = self.connection.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+            if cached_entries <= keep + keep // _EMBEDDING_CACHE_SLACK_DIVISOR:
+                return
+            self.connection.execute(
+                """
+                DELETE FROM embedding_cache
+                WHERE rowid IN (
+                    SELECT rowid FROM embedding_cache ORDER BY rowid DESC LIMIT -1 OFFSET ?
+                )
+                AND text_hash NOT IN (SELECT ragrep_text_hash(text) FROM chunks)
+                """,
+                (keep,),
+            )
+
+    def search(self, query_embedding: Sequence[float] | np.ndarray, limit: int = 20) -> List[Dict[str, Any]]:
         if limit <= 0:
             return []
 
-        query_values = array("f", [float(value) for value in query_embedding])
-        query_norm = _vector_norm(query_values)
+        query_values = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query_values))
         if query_norm == 0:
             return []
 
-        rows = self.connection.execute(
+        # The token, matrix and winning rows are read in one transaction so a
+        # concurrent writer cannot slip a different index version in between.
+        with self._read_snapshot():
+            # Interactive use repeats queries; results are memoised per index_token.
+            index_token = self._index_token()
+            cache_key = (
+                hashlib.blake2b(query_values.tobytes(), digest_size=16).digest(),
+                limit,
+                index_token,
+            )
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                return _format_matches(cached)
+
+            self._load_matrix(query_values.shape[0], index_token)
+            if not self._rowids.size:
+                return []
+
+            # Stored rows are unit length, so the dot product is the cosine similarity.
+            scores = self._matrix @ (query_values / query_norm)
+            top = _top_k_indices(scores, limit)
+            top_rowids = self._rowids[top].tolist()
+            rows = self._fetch_rows(top_rowids)
+            hits = [(*rows[rowid], score) for rowid, score in zip(top_rowids, scores[top].tolist()) if rowid in rows]
+
+            # Raw rows are cached so every caller gets freshly decoded metadata.
+            self._result_cache[cache_key] = hits
+            if len(self._result_cache) > _RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+            return _format_matches(hits)
+
+    def _load_matrix(self, dim: int, index_token: str | None) -> None:
+        """Load all ``dim``-sized embeddings as one contiguous (N, dim) matrix.
+
+        The matrix is memory-mapped from the ``.emb.npy`` sidecar when that was
+        written for the current index; otherwise it is decoded from SQLite (only
+        rowids and vectors are scanned) and the sidecar is refreshed. It is kept
+        until the database's index_token changes, so repeated searches skip both.
+        """
+        if self._matrix is not None and self._cached_token == index_token and self._matrix_dim == dim:
+            return
+
+        sidecar_token = None if self.in_memory else index_token
+        loaded = self._read_matrix_sidecar(dim, sidecar_token) if sidecar_token else None
+
+        if loaded is None:
+            loaded = self._decode_matrix(dim, self._get_metadata().get("vector_format", ""))
+            if sidecar_token:
+                self._write_matrix_sidecar(*loaded, sidecar_token)
+
+        self._matrix, self._rowids = loaded
+        self._matrix_dim = dim
+        self._cached_token = index_token
+
+    def _decode_matrix(self, dim: int, stored_format: str) -> Tuple[np.ndarray, np.ndarray]:
+        # Decode with the dtype the index was written in; rows are upcast to
+        # float32 as they are copied into the matrix so scoring stays on BLAS.
+        stored_dtype = _stored_dtype(stored_format)
+        count = self.connection.execute(
+            "SELECT COUNT(*) FROM chunks WHERE embedding_dim = ? AND embedding_norm > 0",
+            (dim,),
+        ).fetchone()[0]
+        matrix = np.empty((int(count), dim), dtype=np.float32)
+        rowids = np.empty(int(count), dtype=np.int64)
+
+        # Plain tuples in fixed-size batches: each BLOB is viewed with
+        # np.frombuffer and copied once, straight into its preallocated row.
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        cursor.execute(
             """
-            SELECT id, text, metadata_json, embedding, embedding_dim, embedding_norm
+            SELECT rowid, embedding
             FROM chunks
-            """
-        ).fetchall()
-
-        matches: List[Dict[str, Any]] = []
-        for row in rows:
-            if int(row["embedding_dim"]) != len(query_values):
-                continue
-
-            vector = _unpack_vector(row["embedding"])
-            stored_norm = float(row["embedding_norm"]) if row["embedding_norm"] else 0.0
-            if stored_norm == 0:
-                continue
-
-            dot = 0.0
-            for lhs, rhs in zip(vector, query_values):
-                dot += float(lhs) * float(rhs)
-
-            score = dot / (query_norm * stored_norm)
-            metadata = json.loads(row["metadata_json"])
-            matches.append(
-                {
-                    "id": row["id"],
-                    "text": row["text"],
-                    "metadata": metadata,
-                    "score": score,
-                    "distance": 1.0 - score,
-                }
+            WHERE embedding_dim = ? AND embedding_norm > 0
+            """,
+            (dim,),
+        )
+        index = 0
+        while True:
+            batch = cursor.fetchmany(_FETCH_BATCH)
+            if not batch:
+                break
+            for rowid, embedding in batch:
+                matrix[index] = _unpack_vector(embedding, stored_dtype)
+                rowids[index] = rowid
+                index += 1
+        if stored_format.startswith("raw-"):
+            # Indexes written before vectors were stored unit length; normalise
+            # here so they score as cosine similarity until they are rebuilt.
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix, rowids
+
+    def _read_matrix_sidecar(self, dim: int, index_token: str) -> Tuple[np.ndarray, np.ndarray] | None:
+        # The row ids are read first: they carry the token and are written last.
+        try:
+            payload = np.load(self.rowids_path)
+        except (OSError, ValueError):
+            return None
+        header = _sidecar_header(index_token)
+        if payload.dtype != np.int64 or payload.ndim != 1 or not np.array_equal(payload[:len(header)], header):
+            return None
+        rowids = payload[len(header):]
+        try:
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if (
+            matrix.ndim != 2
+            or matrix.dtype != np.float32
+            or matrix.shape[1] != dim
+            or rowids.shape != (matrix.shape[0],)
+        ):
+            return None
+        return matrix, rowids
+
+    def _write_matrix_sidecar(self, matrix: np.ndarray, rowids: np.ndarray, index_token: str) -> None:
+        # The token travels inside the row-id file rather than the database, so
+        # a search never needs the write lock. Each writer uses its own temporary
+        # names (concurrent recalls may refresh the sidecar together) and the row
+        # ids go last, so a half-written sidecar is never trusted.
+        payload = np.concatenate([_sidecar_header(index_token), rowids])
+        suffix = f"{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        for path, array in ((self.matrix_path, matrix), (self.rowids_path, payload)):
+            temp_path = path.with_name(f"{path.name}.{suffix}")
+            try:
+                with open(temp_path, "wb") as handle:
+                    np.save(handle, array)
+                os.replace(temp_path, path)
+            except OSError:
+                temp_path.unlink(missing_ok=True)
+                return
+
+    def _rowids_for_paths(self, paths: Sequence[str]) -> np.ndarray:
+        rowids: List[int] = []
+        for start in range(0, len(paths), _SQL_VARIABLE_BATCH):
+            batch = list(paths[start:start + _SQL_VARIABLE_BATCH])
+            placeholders = ", ".join("?" for _ in batch)
+            rowids.extend(
+                row[0]
+                for row in self.connection.execute(
+                    f"SELECT rowid FROM chunks WHERE file_path IN ({placeholders})",
+                    batch,
+                )
+            )
+        return np.asarray(rowids, dtype=np.int64)
+
+    def _patch_matrix(
+        self,
+        stale_rowids: np.ndarray,
+        changed_paths: Sequence[str],
+        index_token: str,
+        stored_format: str,
+    ) -> None:
+        """Drop stale rows from the cached matrix and append the re-inserted ones.
+
+        Costs O(changed chunks) in SQL instead of re-decoding the whole index.
+        The sidecar is left stale and is rewritten by the next cold load.
+        """
+        dim = self._matrix_dim
+        stored_dtype = _stored_dtype(stored_format)
+        fresh_rows = []
+        for start in range(0, len(changed_paths), _SQL_VARIABLE_BATCH):
+            batch = list(changed_paths[start:start + _SQL_VARIABLE_BATCH])
+            placeholders = ", ".join("?" for _ in batch)
+            fresh_rows.extend(
+                self.connection.execute(
+                    f"""
+                    SELECT rowid, embedding
+                    FROM chunks
+                    WHERE embedding_dim = ? AND embedding_norm > 0 AND file_path IN ({placeholders})
+                    """,
+                    [dim, *batch],
+                ).fetchall()
             )
 
-        matches.sort(key=lambda item: item["score"], reverse=True)
-        return matches[:limit]
+        fresh_matrix = np.empty((len(fresh_rows), dim), dtype=np.float32)
+        fresh_rowids = np.empty(len(fresh_rows), dtype=np.int64)
+        for index, (rowid, embedding) in enumerate(fresh_rows):
+            fresh_matrix[index] = _unpack_vector(embedding, stored_dtype)
+            fresh_rowids[index] = rowid
+
+        keep = ~np.isin(self._rowids, stale_rowids)
+        self._matrix = np.concatenate([self._matrix[keep], fresh_matrix])
+        self._rowids = np.concatenate([self._rowids[keep], fresh_rowids])
+        self._cached_token = index_token
+
+    def _fetch_rows(self, rowids: List[int]) -> Dict[int, Tuple[str, str, str]]:
+        rows: Dict[int, Tuple[str, str, str]] = {}
+        for start in range(0, len(rowids), _SQL_VARIABLE_BATCH):
+            batch = rowids[start:start + _SQL_VARIABLE_BATCH]
+            placeholders = ", ".join("?" for _ in batch)
+            for row in self.connection.execute(
+                f"SELECT rowid, id, text, metadata_json FROM chunks WHERE rowid IN ({placeholders})",
+                batch,
+            ):
+                rows[row["rowid"]] = (row["id"], row["text"], row["metadata_json"])
+        return rows
 
     def get_collection_info(self) -> Dict[str, Any]:
         return self.get_stats()
@@ -445,17 +1002,51 @@ class VectorStore:
             "indexed_at": metadata.get("indexed_at"),
             "chunk_size": int(metadata["chunk_size"]) if metadata.get("chunk_size") else None,
             "chunk_overlap": int(metadata["chunk_overlap"]) if metadata.get("chunk_overlap") else None,
+            "embedding_dim": int(metadata["embedding_dim"]) if metadata.get("embedding_dim") else None,
         }
 
+    def _insert_chunks(self, chunks: List[Dict[str, Any]], embeddings: np.ndarray) -> None:
+        # Rows are generated lazily and normalised one batch at a time, so peak
+        # memory stays flat no matter how many chunks a rebuild writes.
+        for start in range(0, len(chunks), _INSERT_BATCH):
+            stop = start + _INSERT_BATCH
+            unit_vectors, norms = _normalise_rows(embeddings[start:stop])
+            stored_rows = _encode_rows(unit_vectors, self.vector_dtype)
+            self.connection.executemany(
+                """
+                INSERT INTO chunks (
+                    id, file_path, chunk_index, start_char, end_char,
+                    text, metadata_json, embedding, embedding_dim, embedding_norm
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                _chunk_rows(chunks[start:stop], stored_rows, norms, embeddings.shape[1]),
+            )
+
+    def _delete_where_in(self, table: str, column: str, values: Sequence[str]) -> None:
+        for start in range(0, len(values), _SQL_VARIABLE_BATCH):
+            batch = list(values[start:start + _SQL_VARIABLE_BATCH])
+            placeholders = ", ".join("?" for _ in batch)
+            self.connection.execute(
+                f"DELETE FROM {table} WHERE {column} IN ({placeholders})",
+                batch,
+            )
+
+    def _index_token(self) -> str | None:
+        row = self.connection.execute("SELECT value FROM metadata WHERE key = 'index_token'").fetchone()
+        return row[0] if row is not None else None
+
     def _get_metadata(self) -> Dict[str, str]:
         rows = self.connection.execute("SELECT key, value FROM metadata").fetchall()
         return {row["key"]: row["value"] for row in rows}
 
     def _set_metadata(self, key: str, value: str) -> None:
-        self.connection.execute(
+        self._set_metadata_many([(key, value)])
+
+    def _set_metadata_many(self, items: List[Tuple[str, str]]) -> None:
+        self.connection.executemany(
             """
             INSERT INTO metadata (key, value) VALUES (?, ?)
             ON CONFLICT(key) DO UPDATE SET value = excluded.value
             """,
-            (key, value),
+            items,
         )
@@ -1,40 +1,58 @@
 from __future__ import annotations
 
 import json
-import tempfile
 import unittest
-from contextlib import redirect_stdout
-from io import StringIO
-from pathlib import Path
+from io import BytesIO, StringIO, TextIOWrapper
+from types import MappingProxyType
 from unittest.mock import patch
 
 from ragrep.cli import main
 
+_UPDATED_INDEX_RESULT = MappingProxyType(
+    {
+        "indexed": True,
+        "reason": "new files detected, updated files detected, files removed",
+        "root": "/tmp/work",
+        "files": 3,
+        "chunks": 10,
+        "chunks_indexed": 4,
+        "indexed_files": 2,
+        "new_files": ("src/new_file.py",),
+        "updated_files": ("src/changed_file.py",),
+        "removed_files": ("src/removed_file.py",),
+        "full_rebuild": False,
+    }
+)
+
 
 class CLITests(unittest.TestCase):
     def test_stats_flag_alias(self):
-        with tempfile.TemporaryDirectory() as temp_dir:
-            db_path = Path(temp_dir) / ".ragrep.db"
-
-            output = StringIO()
-            with redirect_stdout(output):
-                exit_code = main(["--stats", "--json", "--db-path", str(db_path)])
+        output = StringIO()
+        exit_code = main(["--stats", "--json", "--db-path", ":memory:"], out=output)
 
-            self.assertEqual(exit_code, 0)
-            payload = json.loads(output.getvalue())
-            self.assertEqual(payload["backend"], "sqlite")
-            self.assertEqual(payload["total_chunks"], 0)
+        self.assertEqual(exit_code, 0)
+        payload = json.loads(output.getvalue())
+        self.assertEqual(payload["backend"], "sqlite")
+        self.assertEqual(payload["total_chunks"], 0)
 
     def test_check_gpu_flag_alias(self):
         output = StringIO()
-        with redirect_stdout(output):
-            exit_code = main(["--check-gpu", "--json"])
+        exit_code = main(["--check-gpu", "--json"], out=output)
 
         self.assertEqual(exit_code, 0)
         payload = json.loads(output.getvalue())
         self.assertIn("resolved_device", payload)
         self.assertIn("torch_available", payload)
 
+    def test_json_output_is_ascii_safe(self):
+        output = TextIOWrapper(BytesIO(), encoding="ascii")
+        with patch("ragrep.cli.get_runtime_device_info", return_value={"resolved_device": "café"}):
+            exit_code = main(["--check-gpu", "--json"], out=output)
+
+        self.assertEqual(exit_code, 0)
+        output.seek(0)
+        self.assertEqual(json.loads(output.read()), {"resolved_device": "café"})
+
     def test_index_prints_added_modified_and_removed_file_paths(self):
         class DummyRAG:
             def __init__(self, *args, **kwargs):
@@ -47,24 +65,11 @@ class CLITests(unittest.TestCase):
                 return None
 
             def index(self, path=".", force=False):
-                return {
-                    "indexed": True,
-                    "reason": "new files detected, updated files detected, files removed",
-                    "root": "/tmp/work",
-                    "files": 3,
-                    "chunks": 10,
-                    "chunks_indexed": 4,
-                    "indexed_files": 2,
-                    "new_files": ["src/new_file.py"],
-                    "updated_files": ["src/changed_file.py"],
-                    "removed_files": ["src/removed_file.py"],
-                    "full_rebuild": False,
-                }
+                return _UPDATED_INDEX_RESULT
 
         output = StringIO()
         with patch("ragrep.cli.RAGrep", DummyRAG):
-            with redirect_stdout(output):
-                exit_code = main(["index", "."])
+            exit_code = main(["index", "."], out=output)
 
         self.assertEqual(exit_code, 0)
         text = output.getvalue()
@@ -120,8 +125,7 @@ class CLITests(unittest.TestCase):
 
         output = StringIO()
         with patch("ragrep.cli.RAGrep", DummyRAG):
-            with redirect_stdout(output):
-                exit_code = main(["schema"])
+            exit_code = main(["schema"], out=output)
 
         self.assertEqual(exit_code, 0)
         text = output.getvalue()
@@ -9,16 +9,40 @@ from types import SimpleNamespace
 from types import ModuleType
 from unittest.mock import patch
 
+import numpy as np
+
 from ragrep.retrieval.embeddings import (
     LocalEmbedder,
+    _clear_device_cache,
     default_model_dir,
     get_runtime_device_info,
     resolve_embedding_model,
     resolve_runtime_device,
 )
 
+_FAKE_TORCH_CUDA_ONLY = SimpleNamespace(
+    cuda=SimpleNamespace(is_available=lambda: True),
+    backends=SimpleNamespace(mps=SimpleNamespace(is_available=lambda: False)),
+)
+_FAKE_TORCH_MPS_ONLY = SimpleNamespace(
+    cuda=SimpleNamespace(is_available=lambda: False),
+    backends=SimpleNamespace(mps=SimpleNamespace(is_available=lambda: True)),
+)
+_FAKE_TORCH_CUDA_INVENTORY = SimpleNamespace(
+    cuda=SimpleNamespace(
+        is_available=lambda: True,
+        device_count=lambda: 2,
+        get_device_name=lambda i: f"GPU-{i}",
+    ),
+    backends=SimpleNamespace(mps=SimpleNamespace(is_available=lambda: False)),
+)
+
 
 class EmbeddingConfigTests(unittest.TestCase):
+    def setUp(self):
+        _clear_device_cache()
+        self.addCleanup(_clear_device_cache)
+
     def test_model_alias_resolution(self):
         self.assertEqual(
             resolve_embedding_model("mxbai-embed-large"),
@@ -36,19 +60,11 @@ class EmbeddingConfigTests(unittest.TestCase):
             self.assertEqual(resolve_runtime_device("auto"), "cpu")
 
     def test_device_auto_prefers_cuda(self):
-        fake_torch = SimpleNamespace(
-            cuda=SimpleNamespace(is_available=lambda: True),
-            backends=SimpleNamespace(mps=SimpleNamespace(is_available=lambda: False)),
-        )
-        with patch.dict(sys.modules, {"torch": fake_torch}):
+        with patch.dict(sys.modules, {"torch": _FAKE_TORCH_CUDA_ONLY}):
             self.assertEqual(resolve_runtime_device("auto"), "cuda")
 
     def test_device_auto_uses_mps_when_cuda_missing(self):
-        fake_torch = SimpleNamespace(
-            cuda=SimpleNamespace(is_available=lambda: False),
-            backends=SimpleNamespace(mps=SimpleNamespace(is_available=lambda: True)),
-        )
-        with patch.dict(sys.modules, {"torch": fake_torch}):
+        with patch.dict(sys.modules, {"torch": _FAKE_TORCH_MPS_ONLY}):
             self.assertEqual(resolve_runtime_device("auto"), "mps")
 
     def test_explicit_device_is_respected(self):
@@ -62,20 +78,37 @@ class EmbeddingConfigTests(unittest.TestCase):
             self.assertEqual(info["resolved_device"], "cpu")
 
     def test_runtime_device_info_with_cuda_inventory(self):
+        with patch.dict(sys.modules, {"torch": _FAKE_TORCH_CUDA_INVENTORY}):
+            info = get_runtime_device_info("auto")
+            self.assertTrue(info["torch_available"])
+            self.assertTrue(info["cuda_available"])
+            self.assertEqual(info["cuda_device_count"], 2)
+            self.assertEqual(info["cuda_devices"], ["GPU-0", "GPU-1"])
+
+    def test_device_probe_is_cached_per_torch_module(self):
+        probes = []
+
+        def is_available():
+            probes.append(1)
+            return True
+
         fake_torch = SimpleNamespace(
             cuda=SimpleNamespace(
-                is_available=lambda: True,
-                device_count=lambda: 2,
+                is_available=is_available,
+                device_count=lambda: 1,
                 get_device_name=lambda i: f"GPU-{i}",
             ),
             backends=SimpleNamespace(mps=SimpleNamespace(is_available=lambda: False)),
         )
         with patch.dict(sys.modules, {"torch": fake_torch}):
+            self.assertEqual(resolve_runtime_device("auto"), "cuda")
             info = get_runtime_device_info("auto")
-            self.assertTrue(info["torch_available"])
-            self.assertTrue(info["cuda_available"])
-            self.assertEqual(info["cuda_device_count"], 2)
-            self.assertEqual(info["cuda_devices"], ["GPU-0", "GPU-1"])
+            info["cuda_devices"].append("mutated")
+            self.assertEqual(get_runtime_device_info("auto")["cuda_devices"], ["GPU-0"])
+        self.assertEqual(len(probes), 1)
+
+        with patch.dict(sys.modules, {"torch": None}):
+            self.assertEqual(resolve_runtime_device("auto"), "cpu")
 
     def test_local_embedder_uses_local_files_only_when_model_is_cached(self):
         calls = []
@@ -174,6 +207,189 @@ class EmbeddingConfigTests(unittest.TestCase):
         self.assertTrue(calls[0]["local_files_only"])
         self.assertFalse(calls[1]["local_files_only"])
 
+    def test_embed_texts_sorts_by_length_and_restores_input_order(self):
+        encoded_batches = []
+
+        class FakeSentenceTransformer:
+            def __init__(self, model_name, **kwargs):
+                pass
+
+            def encode(self, items, **kwargs):
+                encoded_batches.append(list(items))
+                return np.asarray([[float(len(item))] for item in items], dtype=np.float32)
+
+        embedder = _build_embedder(FakeSentenceTransformer)
+        vectors = embedder.embed_texts(["ccc", "a", "bb"])
+
+        self.assertEqual(encoded_batches, [["a", "bb", "ccc"]])
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assertEqual(vectors.tolist(), [[3.0], [1.0], [2.0]])
+
+    def test_embed_texts_uses_larger_default_batches_on_cuda(self):
+        batch_sizes = []
+
+        class FakeSentenceTransformer:
+            def __init__(self, model_name, **kwargs):
+                pass
+
+            def encode(self, items, **kwargs):
+                batch_sizes.append(kwargs["batch_size"])
+                return np.zeros((len(items), 1), dtype=np.float32)
+
+        embedder = _build_embedder(FakeSentenceTransformer)
+        embedder.embed_texts(["a"])
+        embedder.embed_texts(["a"], batch_size=8)
+        embedder.device = "cuda:0"
+
+        self.assertEqual(batch_sizes, [32, 8])
+        self.assertEqual(embedder._default_batch_size(), 128)
+
+    def test_embed_query_reuses_cached_vector_for_repeated_queries(self):
+        encoded = []
+
+        class FakeSentenceTransformer:
+            def __init__(self, model_name, **kwargs):
+                pass
+
+            def encode(self, items, **kwargs):
+                encoded.extend(items)
+                return np.asarray([[float(len(item))] for item in items], dtype=np.float32)
+
+        embedder = _build_embedder(FakeSentenceTransformer)
+        first = embedder.embed_query("auth token")
+        second = embedder.embed_query("auth token")
+        embedder.embed_query("login")
+
+        self.assertIs(first, second)
+        self.assertEqual(encoded, ["auth token", "login"])
+        self.assertFalse(first.flags.writeable)
+
+    def test_embed_texts_uses_worker_pool_for_large_inputs(self):
+        events = []
+
+        class FakeSentenceTransformer:
+            def __init__(self, model_name, **kwargs):
+                pass
+
+            def encode(self, items, **kwargs):
+                events.append("encode")
+                return np.ones((len(items), 2), dtype=np.float32)
+
+            def start_multi_process_pool(self, target_devices=None):
+                events.append(("start", tuple(target_devices)))
+                return "pool"
+
+            def encode_multi_process(self, items, pool, batch_size=32):
+                events.append(("encode_multi_process", pool))
+                return np.ones((len(items), 2), dtype=np.float32)
+
+            def stop_multi_process_pool(self, pool):
+                events.append(("stop", pool))
+
+        embedder = _build_embedder(FakeSentenceTransformer, num_workers=2)
+        embedder.embed_texts(["short"])
+        embedder.embed_texts([f"text {index}" for index in range(300)])
+        embedder.embed_texts([f"text {index}" for index in range(300)])
+        embedder.close()
+
+        self.assertEqual(
+            events,
+            [
+                "encode",
+                ("start", ("cpu", "cpu")),
+                ("encode_multi_process", "pool"),
+                ("encode_multi_process", "pool"),
+                ("stop", "pool"),
+            ],
+        )
+
+    def test_encode_parallel_passes_pool_to_encode_when_supported(self):
+        events = []
+
+        class FakeSentenceTransformer:
+            def __init__(self, model_name, **kwargs):
+                pass
+
+            def encode(self, items, batch_size=32, pool=None, **kwargs):
+                events.append(("encode", pool, batch_size))
+                return np.ones((len(items), 2), dtype=np.float32)
+
+            def start_multi_process_pool(self, target_devices=None):
+                return "pool"
+
+            def encode_multi_process(self, items, pool, batch_size=32):
+                raise AssertionError("deprecated helper used")
+
+            def stop_multi_process_pool(self, pool):
+                pass
+
+        embedder = _build_embedder(FakeSentenceTransformer, num_workers=2)
+        vectors = embedder.encode_parallel(["a", "b"], batch_size=16)
+        embedder.close()
+
+        self.assertEqual(events, [("encode", "pool", 16)])
+        self.assertEqual(vectors.shape, (2, 2))
+
+    def test_embed_texts_skips_worker_pool_off_cpu(self):
+        events = []
+
+        class FakeSentenceTransformer:
+            def __init__(self, model_name, **kwargs):
+                pass
+
+            def encode(self, items, **kwargs):
+                events.append("encode")
+                return np.ones((len(items), 2), dtype=np.float32)
+
+            def start_multi_process_pool(self, target_devices=None):
+                events.append(("start", tuple(target_devices)))
+                return "pool"
+
+        embedder = _build_embedder(FakeSentenceTransformer, num_workers=2)
+        embedder.device = "mps"
+        embedder.embed_texts([f"text {index}" for index in range(300)])
+        embedder.close()
+
+        self.assertEqual(events, ["encode"])
+
+    def test_local_embedder_passes_onnx_backend_to_sentence_transformers(self):
+        calls = []
+
+        class FakeSentenceTransformer:
+            def __init__(self, model_name, **kwargs):
+                calls.append(kwargs)
+
+        with patch.dict(os.environ, {"RAGREP_ONNX_FILE": "onnx/model_quantized.onnx"}, clear=False):
+            _build_embedder(FakeSentenceTransformer, backend="onnx")
+        _build_embedder(FakeSentenceTransformer)
+
+        self.assertEqual(calls[0]["backend"], "onnx")
+        self.assertEqual(calls[0]["model_kwargs"], {"file_name": "onnx/model_quantized.onnx"})
+        self.assertNotIn("backend", calls[1])
+
+
+def _build_embedder(sentence_transformer_cls, **kwargs):
+    sentence_transformers = ModuleType("sentence_transformers")
+    huggingface_hub = ModuleType("huggingface_hub")
+    cached_marker = object()
+
+    def try_to_load_from_cache(*, repo_id, filename, cache_dir):
+        return cached_marker
+
+    sentence_transformers.SentenceTransformer = sentence_transformer_cls
+    huggingface_hub.try_to_load_from_cache = try_to_load_from_cache
+    huggingface_hub._CACHED_NO_EXIST = cached_marker
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with patch.dict(
+            sys.modules,
+            {
+                "sentence_transformers": sentence_transformers,
+                "huggingface_hub": huggingface_hub,
+            },
+        ):
+            return LocalEmbedder(model_dir=temp_dir, device="cpu", **kwargs)
+
 
 if __name__ == "__main__":
     unittest.main()
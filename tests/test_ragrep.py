@@ -1,47 +1,71 @@
 from __future__ import annotations
 
+import os
+import re
 import tempfile
-import time
 import unittest
+from functools import lru_cache
 from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
 
 from ragrep import RAGrep
+from ragrep.core.document_processor import DocumentProcessor
+
+
+_VOCAB = (
+    "auth",
+    "login",
+    "token",
+    "database",
+    "query",
+    "payment",
+    "cache",
+    "error",
+    "schema",
+    "user",
+    "message",
+    "type",
+)
+_VOCAB_INDEX = {token: index for index, token in enumerate(_VOCAB)}
+_VOCAB_PATTERN = re.compile("|".join(map(re.escape, _VOCAB)))
 
 
 class FakeEmbedder:
     model = "mxbai-embed-large"
 
-    _vocab = [
-        "auth",
-        "login",
-        "token",
-        "database",
-        "query",
-        "payment",
-        "cache",
-        "error",
-        "schema",
-        "user",
-        "message",
-        "type",
-    ]
-
     def embed_texts(self, texts, batch_size: int = 32):
-        return [self._embed(text) for text in texts]
+        if not texts:
+            return np.empty((0, len(_VOCAB)), dtype=np.float32)
+        return np.stack([_embed_cached(text) for text in texts])
 
     def embed_query(self, query: str):
-        return self._embed(query)
+        return _embed_cached(query)
+
 
-    def _embed(self, text: str):
-        lower = text.lower()
-        vector = []
-        for token in self._vocab:
-            vector.append(float(lower.count(token)))
-        return vector
+@lru_cache(maxsize=1024)
+def _embed_cached(text: str) -> np.ndarray:
+    # Every test writes the same fixture files, so the same chunks recur across tests.
+    # One regex pass finds every vocabulary token; bincount turns them into counts.
+    indices = np.asarray([_VOCAB_INDEX[token] for token in _VOCAB_PATTERN.findall(text.lower())], dtype=np.intp)
+    vector = np.bincount(indices, minlength=len(_VOCAB)).astype(np.float32)
+    vector.flags.writeable = False
+    return vector
+
+
+def _bump_mtime(path: Path) -> None:
+    # Move the mtime forward explicitly; a short sleep is not enough on coarse-mtime filesystems.
+    mtime = path.stat().st_mtime + 1.0
+    os.utime(path, (mtime, mtime))
 
 
 class RAGrepTests(unittest.TestCase):
     def setUp(self):
+        # Test databases live in a TemporaryDirectory; skip the journal and fsyncs.
+        env = patch.dict(os.environ, {"RAGREP_SQLITE_FAST": "1"})
+        env.start()
+        self.addCleanup(env.stop)
         self.tempdir = tempfile.TemporaryDirectory()
         self.root = Path(self.tempdir.name)
         (self.root / "auth.py").write_text(
@@ -72,23 +96,16 @@ class RAGrepTests(unittest.TestCase):
             rag.close()
 
     def test_auto_index_skips_when_unchanged(self):
+        # Neither recall changes the index, so both cases share one indexed store.
         rag = RAGrep(db_path=str(self.db_path), embedder=FakeEmbedder())
         try:
             rag.index(str(self.root))
-            recall_result = rag.recall("database query", path=str(self.root), auto_index=True)
-            self.assertFalse(recall_result["auto_index"]["indexed"])
-            self.assertEqual(recall_result["auto_index"]["reason"], "index is current")
-        finally:
-            rag.close()
-
-    def test_auto_index_uses_indexed_root_when_path_omitted(self):
-        rag = RAGrep(db_path=str(self.db_path), embedder=FakeEmbedder())
-        try:
-            rag.index(str(self.root))
-            recall_result = rag.recall("database query", auto_index=True)
-            self.assertFalse(recall_result["auto_index"]["indexed"])
-            self.assertEqual(recall_result["auto_index"]["reason"], "index is current")
-            self.assertEqual(recall_result["auto_index"]["root"], str(self.root))
+            for case, path in (("explicit path", str(self.root)), ("indexed root", None)):
+                with self.subTest(case=case):
+                    recall_result = rag.recall("database query", path=path, auto_index=True)
+                    self.assertFalse(recall_result["auto_index"]["indexed"])
+                    self.assertEqual(recall_result["auto_index"]["reason"], "index is current")
+                    self.assertEqual(recall_result["auto_index"]["root"], str(self.root))
         finally:
             rag.close()
 
@@ -96,12 +113,12 @@ class RAGrepTests(unittest.TestCase):
         rag = RAGrep(db_path=str(self.db_path), embedder=FakeEmbedder())
         try:
             rag.index(str(self.root))
-            time.sleep(0.001)
             (self.root / "auth.py").write_text(
                 "def login_user(token):\n    return verify_auth_token(token)\n\n"
                 "def payment_auth(token):\n    return token\n",
                 encoding="utf-8",
             )
+            _bump_mtime(self.root / "auth.py")
 
             recall_result = rag.recall("payment auth", path=str(self.root), auto_index=True)
             self.assertTrue(recall_result["auto_index"]["indexed"])
@@ -116,11 +133,11 @@ class RAGrepTests(unittest.TestCase):
         rag = RAGrep(db_path=str(self.db_path), embedder=FakeEmbedder())
         try:
             rag.index(str(self.root))
-            time.sleep(0.001)
             (self.root / "new_feature.py").write_text(
                 "def new_feature_auth(token):\n    return token\n",
                 encoding="utf-8",
             )
+            _bump_mtime(self.root / "new_feature.py")
 
             recall_result = rag.recall("new feature auth", path=str(self.root), auto_index=True)
             self.assertTrue(recall_result["auto_index"]["indexed"])
@@ -145,9 +162,10 @@ class RAGrepTests(unittest.TestCase):
             index_result = rag.index(str(self.root))
             self.assertEqual(index_result["files"], 2)
 
-            time.sleep(0.001)
             (model_dir / "cache.json").write_text("{\"version\": 2}\n", encoding="utf-8")
             (model_dir / "metadata.txt").write_text("updated\n", encoding="utf-8")
+            _bump_mtime(model_dir / "cache.json")
+            _bump_mtime(model_dir / "metadata.txt")
 
             recall_result = rag.recall("database query", path=str(self.root), auto_index=True)
             self.assertFalse(recall_result["auto_index"]["indexed"])
@@ -229,6 +247,102 @@ class RAGrepTests(unittest.TestCase):
         finally:
             rag.close()
 
+    def test_forced_reindex_reuses_cached_embeddings(self):
+        embedder = FakeEmbedder()
+        embedded = []
+        original_embed_texts = embedder.embed_texts
+
+        def counting_embed_texts(texts, batch_size: int = 32):
+            embedded.extend(texts)
+            return original_embed_texts(texts, batch_size)
+
+        embedder.embed_texts = counting_embed_texts
+        rag = RAGrep(db_path=str(self.db_path), embedder=embedder)
+        try:
+            rag.index(str(self.root))
+            self.assertEqual(len(embedded), 2)
+
+            index_result = rag.index(str(self.root), force=True)
+            self.assertTrue(index_result["indexed"])
+            self.assertEqual(len(embedded), 2)
+
+            recall_result = rag.recall("auth login token", limit=1, auto_index=False)
+            self.assertEqual(recall_result["matches"][0]["metadata"]["source"], "auth.py")
+        finally:
+            rag.close()
+
+    def test_new_chunks_are_embedded_and_cached_in_batches(self):
+        embedder = FakeEmbedder()
+        batches = []
+        original_embed_texts = embedder.embed_texts
+
+        def counting_embed_texts(texts, batch_size: int = 32):
+            batches.append(len(texts))
+            return original_embed_texts(texts, batch_size)
+
+        embedder.embed_texts = counting_embed_texts
+        for index in range(3):
+            (self.root / f"extra_{index}.py").write_text(f"value_{index} = {index}\n", encoding="utf-8")
+
+        rag = RAGrep(db_path=str(self.db_path), embedder=embedder)
+        try:
+            with patch("ragrep.core.rag_system._EMBED_BATCH", 2):
+                rag.index(str(self.root))
+            cached = rag.vector_store.connection.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        finally:
+            rag.close()
+
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertEqual(cached, 5)
+
+    def test_threaded_file_reads_keep_chunk_order(self):
+        for index in range(4):
+            (self.root / f"extra_{index}.py").write_text(f"value_{index} = {index}\n", encoding="utf-8")
+        processor = DocumentProcessor()
+        files = processor.scan_files(self.root)
+
+        sequential = processor.process_files(files, self.root)
+        with patch("ragrep.core.document_processor._PARALLEL_READ_MIN_FILES", 1):
+            threaded = processor.process_files(files, self.root)
+
+        self.assertEqual([chunk["id"] for chunk in threaded], [chunk["id"] for chunk in sequential])
+        self.assertEqual([chunk["text"] for chunk in threaded], [chunk["text"] for chunk in sequential])
+
+    def test_blank_query_returns_no_matches_without_embedding(self):
+        rag = RAGrep(db_path=str(self.db_path), embedder=FakeEmbedder())
+        try:
+            rag.index(str(self.root))
+            with patch.object(FakeEmbedder, "embed_query", side_effect=AssertionError("embedded")):
+                result = rag.recall("   ", auto_index=False)
+        finally:
+            rag.close()
+
+        self.assertEqual(result["matches"], [])
+        self.assertEqual(result["count"], 0)
+
+    def test_index_stores_float32_vectors_unless_float16_is_requested(self):
+        for options, expected_format, item_size in (
+            ({}, "unit-float32", 4),
+            ({"vector_dtype": "float16"}, "unit-float16", 2),
+        ):
+            with self.subTest(expected_format=expected_format):
+                db_path = self.root / f"{expected_format}.db"
+                rag = RAGrep(db_path=str(db_path), embedder=FakeEmbedder(), **options)
+                try:
+                    rag.index(str(self.root))
+                    connection = rag.vector_store.connection
+                    vector_format = connection.execute(
+                        "SELECT value FROM metadata WHERE key = 'vector_format'"
+                    ).fetchone()[0]
+                    blob_sizes = {row[0] for row in connection.execute("SELECT length(embedding) FROM chunks")}
+                    recall_result = rag.recall("auth login token", limit=1, auto_index=False)
+                finally:
+                    rag.close()
+
+                self.assertEqual(vector_format, expected_format)
+                self.assertEqual(blob_sizes, {len(_VOCAB) * item_size})
+                self.assertEqual(recall_result["matches"][0]["metadata"]["source"], "auth.py")
+
     def test_stats(self):
         rag = RAGrep(db_path=str(self.db_path), embedder=FakeEmbedder())
         try:
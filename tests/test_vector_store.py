@@ -0,0 +1,531 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from ragrep.retrieval.vector_store import VectorStore
+
+
+def _chunk(path: str, index: int, text: str):
+    return {
+        "id": f"{path}:{index}",
+        "file_path": path,
+        "chunk_index": index,
+        "start_char": 0,
+        "end_char": len(text),
+        "text": text,
+        "metadata": {"source": path, "chunk_index": index},
+    }
+
+
+class VectorStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tempdir.name)
+        self.store = VectorStore(str(self.root / ".ragrep.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tempdir.cleanup()
+
+    def _index(self, chunks, embeddings):
+        files = [
+            {"path": path, "size": 1, "mtime_ns": 1}
+            for path in sorted({chunk["file_path"] for chunk in chunks})
+        ]
+        self.store.replace_index(
+            root_path=self.root,
+            files=files,
+            chunks=chunks,
+            embeddings=embeddings,
+            embedding_model="fake",
+            chunk_size=1000,
+            chunk_overlap=200,
+        )
+
+    def test_connection_pragmas(self):
+        connection = self.store.connection
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(connection.execute("PRAGMA page_size").fetchone()[0], 8192)
+        self.assertEqual(connection.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+        self.assertEqual(connection.execute("PRAGMA user_version").fetchone()[0], 1)
+
+    def test_sqlite_fast_env_drops_journal_and_fsyncs(self):
+        with patch.dict(os.environ, {"RAGREP_SQLITE_FAST": "1"}):
+            store = VectorStore(str(self.root / "fast.db"))
+        try:
+            connection = store.connection
+            self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "memory")
+            self.assertEqual(connection.execute("PRAGMA synchronous").fetchone()[0], 0)
+        finally:
+            store.close()
+
+    def test_memory_db_path_keeps_index_off_disk(self):
+        store = VectorStore(":memory:")
+        try:
+            store.replace_index(
+                root_path=self.root,
+                files=[{"path": "a.py", "size": 1, "mtime_ns": 1}, {"path": "b.py", "size": 1, "mtime_ns": 1}],
+                chunks=[_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")],
+                embeddings=[[1.0, 0.0], [0.0, 1.0]],
+                embedding_model="fake",
+                chunk_size=1000,
+                chunk_overlap=200,
+            )
+            self.assertEqual(store.search([0.0, 1.0], limit=1)[0]["id"], "b.py:0")
+            self.assertEqual(store.get_stats()["persist_path"], ":memory:")
+        finally:
+            store.close()
+
+        self.assertFalse(Path(":memory:").exists())
+        self.assertFalse(Path(":memory:.emb.npy").exists())
+
+    def test_path_lookups_and_counts_are_index_only(self):
+        connection = self.store.connection
+        queries = (
+            ("SELECT rowid FROM chunks WHERE file_path IN (?, ?)", ("a.py", "b.py")),
+            ("SELECT COUNT(*) FROM chunks", ()),
+            ("SELECT COUNT(*) FROM files", ()),
+        )
+        for query, params in queries:
+            with self.subTest(query=query):
+                plan = " ".join(row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}", params))
+                self.assertIn("USING COVERING INDEX", plan)
+
+    def test_search_returns_best_matches_first(self):
+        self._index(
+            [_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b"), _chunk("c.py", 0, "c")],
+            [[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]],
+        )
+
+        matches = self.store.search([0.0, 1.0], limit=2)
+
+        self.assertEqual([match["id"] for match in matches], ["c.py:0", "b.py:0"])
+        self.assertAlmostEqual(matches[0]["score"], 1.0, places=5)
+        self.assertAlmostEqual(matches[1]["distance"], 0.2, places=5)
+
+    def test_replace_index_inserts_across_batch_boundaries(self):
+        chunks = [_chunk(f"file_{index}.py", 0, str(index)) for index in range(5)]
+
+        with patch("ragrep.retrieval.vector_store._INSERT_BATCH", 2):
+            self._index(chunks, [[1.0, float(index)] for index in range(5)])
+
+        self.assertEqual(self.store.get_stats()["total_chunks"], 5)
+        self.assertEqual(self.store.search([0.0, 1.0], limit=1)[0]["id"], "file_4.py:0")
+
+    def test_bulk_load_skips_fsync_during_rebuild_and_restores_it(self):
+        seen = []
+        insert_chunks = self.store._insert_chunks
+
+        def recording_insert(chunks, embeddings):
+            seen.append(self.store.connection.execute("PRAGMA synchronous").fetchone()[0])
+            insert_chunks(chunks, embeddings)
+
+        with patch.object(self.store, "_insert_chunks", recording_insert):
+            self.store.replace_index(
+                root_path=self.root,
+                files=[{"path": "a.py", "size": 1, "mtime_ns": 1}],
+                chunks=[_chunk("a.py", 0, "a")],
+                embeddings=[[1.0, 0.0]],
+                embedding_model="fake",
+                chunk_size=1000,
+                chunk_overlap=200,
+                bulk_load=True,
+            )
+
+        self.assertEqual(seen, [0])
+        self.assertEqual(self.store.connection.execute("PRAGMA synchronous").fetchone()[0], 1)
+        self.assertEqual(self.store.get_stats()["total_chunks"], 1)
+
+    def test_search_parses_metadata_only_for_returned_rows(self):
+        chunks = [_chunk(f"file_{index}.py", 0, str(index)) for index in range(10)]
+        self._index(chunks, [[1.0, float(index)] for index in range(10)])
+
+        with patch("ragrep.retrieval.vector_store._json_loads", wraps=json.loads) as loads:
+            matches = self.store.search([0.0, 1.0], limit=3)
+
+        self.assertEqual(len(matches), 3)
+        self.assertEqual(loads.call_count, 3)
+        self.assertEqual(matches[0]["metadata"], {"source": "file_9.py", "chunk_index": 0})
+
+    def test_metadata_accepts_whatever_json_dumps_accepts(self):
+        chunk = _chunk("a.py", 0, "a")
+        chunk["metadata"] = {1: "one", "big": 2**70, "ratio": float("nan")}
+        self._index([chunk], [[1.0, 0.0]])
+
+        stored = self.store.connection.execute("SELECT metadata_json FROM chunks").fetchone()[0]
+        metadata = self.store.search([1.0, 0.0])[0]["metadata"]
+
+        self.assertEqual(stored, json.dumps(chunk["metadata"], separators=(",", ":")))
+        self.assertEqual(metadata["1"], "one")
+        self.assertNotEqual(metadata["ratio"], metadata["ratio"])
+
+    def test_repeated_search_only_fetches_winning_rows(self):
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+        self.store.search([0.0, 1.0])
+        statements = []
+        self.store.connection.set_trace_callback(statements.append)
+
+        matches = self.store.search([1.0, 0.0], limit=1)
+        chunk_reads = [statement for statement in statements if "FROM chunks" in statement]
+
+        self.assertEqual([match["id"] for match in matches], ["a.py:0"])
+        self.assertEqual(len(chunk_reads), 1)
+        self.assertIn("WHERE rowid IN (", chunk_reads[0])
+
+    def test_identical_search_is_served_from_result_cache(self):
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+        first = self.store.search([0.0, 1.0], limit=1)
+        first[0]["text"] = "mutated by caller"
+        first[0]["metadata"]["source"] = "mutated by caller"
+        statements = []
+        self.store.connection.set_trace_callback(statements.append)
+
+        second = self.store.search([0.0, 1.0], limit=1)
+
+        self.assertFalse(any("FROM chunks" in statement for statement in statements))
+        self.assertEqual(second[0]["text"], "b")
+        self.assertEqual(second[0]["metadata"]["source"], "b.py")
+
+    def test_cached_search_sees_deletion_by_another_connection(self):
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+        self.assertEqual(self.store.search([1.0, 0.0], limit=1)[0]["id"], "a.py:0")
+
+        other = VectorStore(str(self.root / ".ragrep.db"))
+        try:
+            other.apply_file_updates(
+                root_path=self.root,
+                all_files=[{"path": "b.py", "size": 1, "mtime_ns": 1}],
+                chunks=[],
+                embeddings=np.empty((0, 2), dtype=np.float32),
+                new_files=[],
+                updated_files=[],
+                removed_files=["a.py"],
+                embedding_model="fake",
+                chunk_size=1000,
+                chunk_overlap=200,
+            )
+        finally:
+            other.close()
+
+        self.assertEqual([match["id"] for match in self.store.search([1.0, 0.0], limit=1)], ["b.py:0"])
+
+    def test_search_sees_index_changes_after_cached_search(self):
+        self._index([_chunk("a.py", 0, "a")], [[1.0, 0.0]])
+        self.assertEqual([match["id"] for match in self.store.search([0.0, 1.0])], ["a.py:0"])
+
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+
+        self.assertEqual(
+            [match["id"] for match in self.store.search([0.0, 1.0])],
+            ["b.py:0", "a.py:0"],
+        )
+
+    def test_search_sees_rebuild_made_by_another_connection(self):
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+        self.assertEqual(self.store.search([1.0, 0.0], limit=1)[0]["id"], "a.py:0")
+
+        other = VectorStore(str(self.root / ".ragrep.db"))
+        try:
+            other.replace_index(
+                root_path=self.root,
+                files=[{"path": "b.py", "size": 1, "mtime_ns": 1}, {"path": "c.py", "size": 1, "mtime_ns": 1}],
+                chunks=[_chunk("b.py", 0, "b"), _chunk("c.py", 0, "c")],
+                embeddings=[[0.0, 1.0], [-1.0, 0.0]],
+                embedding_model="fake",
+                chunk_size=1000,
+                chunk_overlap=200,
+            )
+        finally:
+            other.close()
+
+        matches = self.store.search([1.0, 0.0], limit=2)
+
+        self.assertEqual([match["id"] for match in matches], ["b.py:0", "c.py:0"])
+        self.assertAlmostEqual(matches[0]["score"], 0.0, places=5)
+        self.assertAlmostEqual(matches[1]["score"], -1.0, places=5)
+
+    def test_reopened_store_memory_maps_matrix_sidecar(self):
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+        self.store.search([0.0, 1.0])
+        self.store.close()
+
+        self.store = VectorStore(str(self.root / ".ragrep.db"))
+        matches = self.store.search([1.0, 0.0])
+
+        self.assertTrue(self.store.matrix_path.exists())
+        self.assertIsInstance(self.store._matrix, np.memmap)
+        self.assertEqual(matches[0]["id"], "a.py:0")
+
+        self._index([_chunk("c.py", 0, "c")], [[0.0, 1.0]])
+        self.assertEqual([match["id"] for match in self.store.search([0.0, 1.0])], ["c.py:0"])
+        self.assertNotIsInstance(self.store._matrix, np.memmap)
+
+    def test_failed_sidecar_write_leaves_no_temporary_files(self):
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+
+        with patch("ragrep.retrieval.vector_store.np.save", side_effect=OSError("disk full")):
+            matches = self.store.search([0.0, 1.0])
+
+        self.assertEqual(matches[0]["id"], "b.py:0")
+        self.assertEqual(list(self.root.glob("*.tmp")), [])
+        self.assertFalse(self.store.matrix_path.exists())
+
+    def test_cold_search_succeeds_while_another_connection_holds_write_lock(self):
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+        self.store.close()
+        self.store = VectorStore(str(self.root / ".ragrep.db"))
+        writer = VectorStore(str(self.root / ".ragrep.db"))
+        try:
+            writer.connection.execute("BEGIN IMMEDIATE")
+            matches = self.store.search([0.0, 1.0])
+            writer.connection.rollback()
+        finally:
+            writer.close()
+
+        self.assertEqual(matches[0]["id"], "b.py:0")
+        self.assertTrue(self.store.rowids_path.exists())
+
+    def test_matrix_decode_ignores_rows_committed_mid_load(self):
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+        writer = sqlite3.connect(str(self.root / ".ragrep.db"))
+        inserted = []
+
+        def insert_before_scan(statement):
+            if "SELECT rowid, embedding" in statement and not inserted:
+                inserted.append(statement)
+                with writer:
+                    writer.execute(
+                        """
+                        INSERT INTO chunks
+                        SELECT 'a.py:1', file_path, 1, start_char, end_char, text,
+                               metadata_json, embedding, embedding_dim, embedding_norm
+                        FROM chunks WHERE id = 'a.py:0'
+                        """
+                    )
+
+        self.store.connection.set_trace_callback(insert_before_scan)
+        try:
+            matches = self.store.search([1.0, 0.0])
+        finally:
+            self.store.connection.set_trace_callback(None)
+            writer.close()
+
+        self.assertTrue(inserted)
+        self.assertEqual([match["id"] for match in matches], ["a.py:0", "b.py:0"])
+
+    def test_float16_vectors_halve_blob_size_and_rebuild_on_dtype_change(self):
+        self.store.close()
+        self.store = VectorStore(str(self.root / ".ragrep.db"), vector_dtype="float16")
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.6, 0.8]])
+
+        blob_size = self.store.connection.execute("SELECT length(embedding) FROM chunks").fetchone()[0]
+        matches = self.store.search([0.0, 1.0])
+        self.store.close()
+        self.store = VectorStore(str(self.root / ".ragrep.db"))
+        plan = self.store.plan_index_update(
+            root_path=self.root,
+            files=[{"path": "a.py", "size": 1, "mtime_ns": 1}, {"path": "b.py", "size": 1, "mtime_ns": 1}],
+            embedding_model="fake",
+            chunk_size=1000,
+            chunk_overlap=200,
+        )
+
+        self.assertEqual(blob_size, 4)
+        self.assertEqual(matches[0]["id"], "b.py:0")
+        self.assertAlmostEqual(matches[0]["score"], 0.8, places=3)
+        self.assertEqual(plan["reason"], "index format changed")
+
+    def test_int8_vectors_store_scale_prefix_and_keep_ranking(self):
+        self.store.close()
+        self.store = VectorStore(str(self.root / ".ragrep.db"), vector_dtype="int8")
+        self._index(
+            [_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b"), _chunk("c.py", 0, "c")],
+            [[1.0, 0.0, 0.0], [0.6, 0.8, 0.0], [0.0, 0.0, 2.0]],
+        )
+
+        blob_size = self.store.connection.execute("SELECT length(embedding) FROM chunks").fetchone()[0]
+        matches = self.store.search([0.0, 1.0, 0.0])
+
+        self.assertEqual(blob_size, 4 + 3)
+        self.assertEqual(matches[0]["id"], "b.py:0")
+        self.assertAlmostEqual(matches[0]["score"], 0.8, places=2)
+        self.assertAlmostEqual(matches[1]["score"], 0.0, places=5)
+
+    def test_embedding_dimension_is_recorded_and_enforced(self):
+        self._index([_chunk("a.py", 0, "a")], [[1.0, 0.0]])
+
+        with self.assertRaises(ValueError):
+            self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [1.0, 0.0, 0.0]])
+        with self.assertRaises(ValueError):
+            self.store.apply_file_updates(
+                root_path=self.root,
+                all_files=[{"path": "a.py", "size": 2, "mtime_ns": 2}],
+                chunks=[_chunk("a.py", 0, "a")],
+                embeddings=[[1.0, 0.0, 0.0]],
+                new_files=[],
+                updated_files=["a.py"],
+                removed_files=[],
+                embedding_model="fake",
+                chunk_size=1000,
+                chunk_overlap=200,
+            )
+        self.assertEqual(self.store.get_stats()["embedding_dim"], 2)
+
+    def test_embedding_cache_pruning_keeps_entries_for_live_chunks(self):
+        self.store.cache_embeddings("fake", ["live"], [[1.0, 0.0]])
+        self._index([_chunk("a.py", 0, "live")], [[1.0, 0.0]])
+
+        with patch("ragrep.retrieval.vector_store._EMBEDDING_CACHE_MIN_ENTRIES", 2):
+            for index in range(10):
+                self.store.cache_embeddings("fake", [f"edit {index}"], [[0.0, 1.0]])
+
+        cached = self.store.connection.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        self.assertIn(0, self.store.get_cached_embeddings("fake", ["live"]))
+        self.assertIn(0, self.store.get_cached_embeddings("fake", ["edit 9"]))
+        self.assertLessEqual(cached, 4)
+
+    def test_legacy_raw_vectors_seed_embedding_cache_and_force_rebuild(self):
+        self._index([_chunk("a.py", 0, "alpha")], [[3.0, 4.0]])
+        with self.store.connection:
+            self.store.connection.execute("DELETE FROM embedding_cache")
+            self.store.connection.execute("DELETE FROM metadata WHERE key = 'vector_format'")
+            self.store.connection.execute(
+                "UPDATE chunks SET embedding = ?",
+                (np.asarray([3.0, 4.0], dtype=np.float32).tobytes(),),
+            )
+        self.store.close()
+
+        self.store = VectorStore(str(self.root / ".ragrep.db"))
+        plan = self.store.plan_index_update(
+            root_path=self.root,
+            files=[{"path": "a.py", "size": 1, "mtime_ns": 1}],
+            embedding_model="fake",
+            chunk_size=1000,
+            chunk_overlap=200,
+        )
+        cached = self.store.get_cached_embeddings("fake", ["alpha"])
+
+        self.assertTrue(plan["full_rebuild"])
+        self.assertEqual(plan["reason"], "index format changed")
+        self.assertEqual(cached[0].tolist(), [3.0, 4.0])
+
+    def test_legacy_raw_vectors_score_as_cosine_before_rebuild(self):
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+        with self.store.connection:
+            self.store.connection.execute("DELETE FROM metadata WHERE key = 'vector_format'")
+            for path, vector in (("a.py", [10.0, 1.0]), ("b.py", [0.0, 1.0])):
+                self.store.connection.execute(
+                    "UPDATE chunks SET embedding = ? WHERE file_path = ?",
+                    (np.asarray(vector, dtype=np.float32).tobytes(), path),
+                )
+        self.store.close()
+
+        self.store = VectorStore(str(self.root / ".ragrep.db"))
+        matches = self.store.search([0.0, 1.0])
+
+        self.assertEqual([match["id"] for match in matches], ["b.py:0", "a.py:0"])
+        self.assertAlmostEqual(matches[0]["score"], 1.0, places=5)
+        self.assertAlmostEqual(matches[1]["score"], 1.0 / np.hypot(10.0, 1.0), places=5)
+
+    def test_apply_file_updates_patches_warm_matrix_without_full_reload(self):
+        self._index(
+            [_chunk("keep.py", 0, "keep"), _chunk("edit.py", 0, "old"), _chunk("gone.py", 0, "gone")],
+            [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+        )
+        self.store.search([1.0, 0.0])
+
+        self.store.apply_file_updates(
+            root_path=self.root,
+            all_files=[
+                {"path": "edit.py", "size": 2, "mtime_ns": 2},
+                {"path": "keep.py", "size": 1, "mtime_ns": 1},
+            ],
+            chunks=[_chunk("edit.py", 0, "new")],
+            embeddings=[[-1.0, 0.0]],
+            new_files=[],
+            updated_files=["edit.py"],
+            removed_files=["gone.py"],
+            embedding_model="fake",
+            chunk_size=1000,
+            chunk_overlap=200,
+        )
+        statements = []
+        self.store.connection.set_trace_callback(statements.append)
+        matches = self.store.search([0.0, 1.0])
+
+        self.assertEqual([match["text"] for match in matches], ["keep", "new"])
+        self.assertEqual(len(self.store._rowids), 2)
+        self.assertFalse(any("COUNT(*)" in statement for statement in statements))
+
+    def test_apply_file_updates_only_rewrites_changed_and_removed_files(self):
+        self._index(
+            [_chunk("keep.py", 0, "keep"), _chunk("edit.py", 0, "old"), _chunk("gone.py", 0, "gone")],
+            [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+        )
+        keep_rowid = self.store.connection.execute(
+            "SELECT rowid FROM chunks WHERE file_path = 'keep.py'"
+        ).fetchone()[0]
+
+        self.store.apply_file_updates(
+            root_path=self.root,
+            all_files=[
+                {"path": "edit.py", "size": 2, "mtime_ns": 2},
+                {"path": "keep.py", "size": 1, "mtime_ns": 1},
+            ],
+            chunks=[_chunk("edit.py", 0, "new")],
+            embeddings=[[0.0, 1.0]],
+            new_files=[],
+            updated_files=["edit.py"],
+            removed_files=["gone.py"],
+            embedding_model="fake",
+            chunk_size=1000,
+            chunk_overlap=200,
+        )
+
+        rows = self.store.connection.execute(
+            "SELECT rowid, file_path, text FROM chunks ORDER BY file_path"
+        ).fetchall()
+        self.assertEqual([(row["file_path"], row["text"]) for row in rows], [("edit.py", "new"), ("keep.py", "keep")])
+        self.assertEqual(rows[1]["rowid"], keep_rowid)
+        self.assertEqual(self.store.get_stats()["total_files"], 2)
+
+    def test_apply_file_updates_rejects_index_written_in_another_vector_format(self):
+        self._index([_chunk("a.py", 0, "a"), _chunk("b.py", 0, "b")], [[1.0, 0.0], [0.0, 1.0]])
+        half = VectorStore(str(self.root / ".ragrep.db"), vector_dtype="float16")
+        try:
+            with self.assertRaisesRegex(ValueError, "Vector format"):
+                half.apply_file_updates(
+                    root_path=self.root,
+                    all_files=[
+                        {"path": "a.py", "size": 2, "mtime_ns": 2},
+                        {"path": "b.py", "size": 1, "mtime_ns": 1},
+                    ],
+                    chunks=[_chunk("a.py", 0, "new")],
+                    embeddings=[[1.0, 0.0]],
+                    new_files=[],
+                    updated_files=["a.py"],
+                    removed_files=[],
+                    embedding_model="fake",
+                    chunk_size=1000,
+                    chunk_overlap=200,
+                )
+        finally:
+            half.close()
+
+        vector_format = self.store.connection.execute(
+            "SELECT value FROM metadata WHERE key = 'vector_format'"
+        ).fetchone()[0]
+        self.assertEqual(vector_format, "unit-float32")
+        self.assertEqual([match["id"] for match in self.store.search([1.0, 0.0])], ["a.py:0", "b.py:0"])
+
+
+if __name__ == "__main__":
+    unittest.main()